@@ -0,0 +1,221 @@
+import asyncio
+from pathlib import Path
+from typing import Optional
+from fastapi import APIRouter, HTTPException, status, Depends
+from app.core.config import settings
+from app.core.database import get_pool_stats
+from app.core.migrations import run_migrations
+from app.models.rescore_job import RescoreJobModel
+from app.models.student_summary import StudentSummaryModel
+from app.models.user import UserModel
+from app.schemas.admin import (
+    ModelInfo,
+    ModelReloadRequest,
+    ModelReloadResponse,
+    RescoreRequest,
+    RescoreJobStatus,
+    UserAdminUpdate,
+)
+from app.schemas.user import User
+from app.services.ml_service import ml_service
+from app.services.rescore import create_job, claim_job, start_rescore
+from app.services.user_cache import user_cache
+from app.utils.dependencies import get_current_admin_user
+
+router = APIRouter()
+
+
+@router.get("/model", response_model=ModelInfo)
+async def get_model_info(
+    current_user: User = Depends(get_current_admin_user)
+):
+    """
+    Get the version and source of the active model.
+    """
+    return ModelInfo(**ml_service.model_info())
+
+
+@router.post("/model/reload", response_model=ModelReloadResponse)
+async def reload_model(
+    reload_in: Optional[ModelReloadRequest] = None,
+    current_user: User = Depends(get_current_admin_user)
+):
+    """
+    Load a model in the background, validate it on a canary batch and
+    atomically swap it in. In-flight requests finish on the previous model.
+    
+    Only the worker process serving this request reloads; with several
+    workers, replace the watched model file (MODEL_WATCH_INTERVAL_SECONDS)
+    or restart the workers to switch all of them.
+    """
+    model_path = None
+    if reload_in and reload_in.model_path:
+        model_dir = Path(settings.MODEL_PATH).resolve().parent
+        requested = Path(reload_in.model_path)
+        if not requested.is_absolute():
+            requested = model_dir / requested
+        model_path = requested.resolve()
+        if model_dir not in model_path.parents:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Model path must be inside {model_dir}"
+            )
+    
+    try:
+        result = await asyncio.to_thread(
+            ml_service.reload_model, str(model_path) if model_path else None
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error reloading model: {str(e)}"
+        )
+    
+    return ModelReloadResponse(**result)
+
+
+@router.post("/rescore", response_model=RescoreJobStatus, status_code=status.HTTP_202_ACCEPTED)
+async def start_rescore_job(
+    rescore_in: Optional[RescoreRequest] = None,
+    current_user: User = Depends(get_current_admin_user)
+):
+    """
+    Re-score stored students with the active model in the background.
+    
+    Students are streamed in batches, predicted with one model call per batch
+    and updated with one bulk write, checkpointing after every batch.
+    """
+    rescore_in = rescore_in or RescoreRequest()
+    job = await create_job(
+        batch_size=rescore_in.batch_size,
+        max_ops_per_second=rescore_in.max_ops_per_second,
+        only_stale=rescore_in.only_stale,
+        created_by=current_user.username
+    )
+    start_rescore(job)
+    
+    return RescoreJobStatus(**await RescoreJobModel.get_by_id(str(job["_id"])))
+
+
+@router.get("/rescore/{job_id}", response_model=RescoreJobStatus)
+async def get_rescore_job(
+    job_id: str,
+    current_user: User = Depends(get_current_admin_user)
+):
+    """
+    Get progress of a re-score job.
+    """
+    job = await RescoreJobModel.get_by_id(job_id)
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Re-score job not found"
+        )
+    
+    return RescoreJobStatus(**job)
+
+
+@router.post("/rescore/{job_id}/resume", response_model=RescoreJobStatus, status_code=status.HTTP_202_ACCEPTED)
+async def resume_rescore_job(
+    job_id: str,
+    current_user: User = Depends(get_current_admin_user)
+):
+    """
+    Resume an interrupted or failed re-score job from its last checkpoint.
+    """
+    if not await RescoreJobModel.get_by_id(job_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Re-score job not found"
+        )
+    
+    job = await claim_job(job_id)
+    if job is None:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Re-score job is already completed or still running"
+        )
+    start_rescore(job)
+    
+    return RescoreJobStatus(**await RescoreJobModel.get_by_id(job_id))
+
+
+@router.get("/migrations")
+async def get_migration_report(
+    current_user: User = Depends(get_current_admin_user)
+):
+    """
+    Dry run of the index migrations: applied and pending versions, and which
+    application queries are index-backed now or after the pending migrations.
+    """
+    return await run_migrations(dry_run=True)
+
+
+@router.post("/analytics/rebuild")
+async def rebuild_analytics(
+    current_user: User = Depends(get_current_admin_user)
+):
+    """
+    Recompute the materialized risk summaries from the students collection.
+    """
+    try:
+        await StudentSummaryModel.rebuild()
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error rebuilding analytics: {str(e)}"
+        )
+    
+    return {"groups": len(await StudentSummaryModel.get_all())}
+
+
+@router.patch("/users/{username}", response_model=User)
+async def update_user(
+    username: str,
+    user_update: UserAdminUpdate,
+    current_user: User = Depends(get_current_admin_user)
+):
+    """
+    Change or deactivate a user account. The user's cached record is
+    invalidated, so the change applies to their next request.
+    """
+    user = await UserModel.update(username, user_update.model_dump(exclude_unset=True))
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User not found"
+        )
+    
+    return User(
+        id=user["_id"],
+        username=user["username"],
+        email=user["email"],
+        full_name=user.get("full_name"),
+        is_active=user["is_active"],
+        created_at=user["created_at"]
+    )
+
+
+@router.get("/cache/users")
+async def get_user_cache_stats(
+    current_user: User = Depends(get_current_admin_user)
+):
+    """
+    Get hit/miss/coalesced counters of the authenticated-user cache.
+    """
+    return user_cache.stats()
+
+
+@router.get("/database/pool")
+async def get_database_pool_stats(
+    current_user: User = Depends(get_current_admin_user)
+):
+    """
+    Get MongoDB pool settings and per-server connection counters.
+    """
+    return get_pool_stats()
@@ -0,0 +1,64 @@
+from typing import Optional
+from fastapi import APIRouter, Depends, Query
+from app.models.student_summary import RISK_LEVELS, SUMMARY_FEATURES, StudentSummaryModel
+from app.schemas.analytics import GroupRiskSummary, RiskSummary, RiskSummaryResponse
+from app.schemas.user import User
+from app.utils.dependencies import get_current_active_user
+
+router = APIRouter()
+
+
+def _to_summary(totals: dict) -> dict:
+    """Turn stored counters and sums into counts and means."""
+    count = totals.get("count", 0)
+    scored_count = totals.get("scored_count", 0)
+    risk_levels = totals.get("risk_levels", {})
+    feature_sums = totals.get("feature_sums", {})
+    return {
+        "count": count,
+        "risk_levels": {level: int(risk_levels.get(level, 0)) for level in RISK_LEVELS},
+        "average_risk_score": round(totals["risk_score_sum"] / scored_count, 2) if scored_count else None,
+        "feature_means": {
+            feature: round(feature_sums.get(feature, 0) / count, 2) if count else None
+            for feature in SUMMARY_FEATURES
+        },
+    }
+
+
+@router.get("/risk-summary", response_model=RiskSummaryResponse)
+async def get_risk_summary(
+    department: Optional[str] = Query(None),
+    semester: Optional[int] = Query(None, ge=1, le=8),
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    Get risk level counts, mean risk score and feature means per department
+    and semester, plus the overall totals, from the materialized summaries.
+    """
+    filters = {}
+    if department:
+        filters["department"] = department
+    if semester:
+        filters["semester"] = semester
+    
+    summaries = await StudentSummaryModel.get_all(filters)
+    
+    overall = {"count": 0, "scored_count": 0, "risk_score_sum": 0.0, "risk_levels": {}, "feature_sums": {}}
+    groups = []
+    for summary in summaries:
+        overall["count"] += summary.get("count", 0)
+        overall["scored_count"] += summary.get("scored_count", 0)
+        overall["risk_score_sum"] += summary.get("risk_score_sum", 0)
+        for level, value in summary.get("risk_levels", {}).items():
+            overall["risk_levels"][level] = overall["risk_levels"].get(level, 0) + value
+        for feature, value in summary.get("feature_sums", {}).items():
+            overall["feature_sums"][feature] = overall["feature_sums"].get(feature, 0) + value
+        
+        groups.append(GroupRiskSummary(
+            department=summary.get("department"),
+            semester=summary.get("semester"),
+            updated_at=summary.get("updated_at"),
+            **_to_summary(summary)
+        ))
+    
+    return RiskSummaryResponse(overall=RiskSummary(**_to_summary(overall)), groups=groups)
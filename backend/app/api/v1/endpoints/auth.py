@@ -1,14 +1,40 @@
 from datetime import timedelta
 from fastapi import APIRouter, HTTPException, status, Depends
 from fastapi.security import OAuth2PasswordRequestForm
+from pymongo.errors import DuplicateKeyError
 from app.schemas.user import UserCreate, User, Token, UserLogin
 from app.models.user import UserModel
-from app.core.security import verify_password, get_password_hash, create_access_token
+from app.core.security import create_access_token
 from app.core.config import settings
+from app.services.password_hasher import PasswordHasherBusy, password_hasher
 
 router = APIRouter()
 
 
+def _busy_exception(e: PasswordHasherBusy) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail=str(e),
+        headers={"Retry-After": "1"},
+    )
+
+
+async def _hash_password(password: str) -> str:
+    """Hash on the password pool; 503 when the pool is saturated."""
+    try:
+        return await password_hasher.hash(password)
+    except PasswordHasherBusy as e:
+        raise _busy_exception(e)
+
+
+async def _verify_password(plain_password: str, hashed_password: str) -> bool:
+    """Verify on the password pool; 503 when the pool is saturated."""
+    try:
+        return await password_hasher.verify(plain_password, hashed_password)
+    except PasswordHasherBusy as e:
+        raise _busy_exception(e)
+
+
 @router.post("/register", response_model=User, status_code=status.HTTP_201_CREATED)
 async def register(user_in: UserCreate):
     """
@@ -35,10 +61,18 @@ async def register(user_in: UserCreate):
         "username": user_in.username,
         "email": user_in.email,
         "full_name": user_in.full_name,
-        "hashed_password": get_password_hash(user_in.password)
+        "hashed_password": await _hash_password(user_in.password)
     }
     
-    created_user = await UserModel.create(user_data)
+    # The unique indexes reject a concurrent registration that passed the checks above
+    try:
+        created_user = await UserModel.create(user_data)
+    except DuplicateKeyError as e:
+        field = "Email" if "email" in ((e.details or {}).get("keyPattern") or {}) else "Username"
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"{field} already registered"
+        )
     
     return User(
         id=created_user["_id"],
@@ -65,7 +99,7 @@ async def login(form_data: OAuth2PasswordRequestForm = Depends()):
         )
     
     # Verify password
-    if not verify_password(form_data.password, user["hashed_password"]):
+    if not await _verify_password(form_data.password, user["hashed_password"]):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
@@ -104,7 +138,7 @@ async def login_json(user_in: UserLogin):
         )
     
     # Verify password
-    if not verify_password(user_in.password, user["hashed_password"]):
+    if not await _verify_password(user_in.password, user["hashed_password"]):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
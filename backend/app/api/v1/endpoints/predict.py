@@ -1,8 +1,16 @@
 from fastapi import APIRouter, HTTPException, status, Depends
-from app.schemas.student import PredictionRequest, PredictionResponse, RiskFactor
+from app.core.config import settings
+from app.schemas.student import (
+    PredictionRequest,
+    PredictionResponse,
+    BatchPredictionRequest,
+    BatchPredictionResponse,
+)
 from app.schemas.user import User
+from app.services.inference_dispatcher import inference_dispatcher
 from app.services.ml_service import ml_service
 from app.utils.dependencies import get_current_active_user
+from app.utils.responses import prediction_response, predictions_response
 
 router = APIRouter()
 
@@ -31,33 +39,51 @@ async def predict_dropout(
             "previous_semester_gpa": prediction_input.previous_semester_gpa
         }
         
-        # Get prediction
-        dropout_prob, risk_score, risk_level = ml_service.predict_dropout_probability(features)
+        # Get prediction with top 3 risk factors (batched off the event loop)
+        prediction = await inference_dispatcher.predict(features, explain=True)
         
-        # Get feature importance (top 3 risk factors)
-        top_features = ml_service.get_feature_importance(features)
-        
-        # Generate explanations
-        explanations = ml_service.get_risk_explanation(top_features)
+        return prediction_response(prediction)
+    
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error during prediction: {str(e)}"
+        )
+
+
+@router.post("/batch", response_model=BatchPredictionResponse)
+async def predict_dropout_batch(
+    batch_input: BatchPredictionRequest,
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    Predict dropout probability for many students in one request.
+    
+    Accepts either a list of student feature objects (`students`) or
+    column-oriented arrays (`columns`). All rows are scored with a single
+    model call and results are returned in request order.
+    """
+    batch_size = len(batch_input)
+    if batch_size > settings.MAX_PREDICTION_BATCH_SIZE:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Batch size {batch_size} exceeds maximum of {settings.MAX_PREDICTION_BATCH_SIZE}"
+        )
+    
+    try:
+        if batch_input.students is not None:
+            features = [student.model_dump() for student in batch_input.students]
+        else:
+            features = batch_input.columns.model_dump()
         
-        # Format risk factors with explanations
-        risk_factors = []
-        for i, factor in enumerate(top_features):
-            risk_factors.append(
-                RiskFactor(
-                    feature=factor["feature"],
-                    value=factor["value"],
-                    importance=factor["importance"],
-                    explanation=explanations[i] if i < len(explanations) else ""
-                )
-            )
+        predictions = await inference_dispatcher.predict_many(features)
         
-        return PredictionResponse(
-            dropout_probability=dropout_prob,
-            risk_score=risk_score,
-            risk_level=risk_level,
-            risk_factors=risk_factors
-        )
+        return predictions_response(predictions)
     
     except ValueError as e:
         raise HTTPException(
@@ -67,5 +93,18 @@ async def predict_dropout(
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Error during prediction: {str(e)}"
+            detail=f"Error during batch prediction: {str(e)}"
         )
+
+
+@router.get("/cache/stats")
+async def get_prediction_cache_stats(
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    Prediction cache counters (hits, misses, evictions, expirations) for monitoring.
+    """
+    return {
+        "model_version": ml_service.model_version,
+        **ml_service.cache.stats()
+    }
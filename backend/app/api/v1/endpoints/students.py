@@ -1,13 +1,32 @@
-from typing import List, Optional
-from fastapi import APIRouter, HTTPException, status, Depends, Query
-from app.schemas.student import StudentCreate, Student, StudentUpdate
+from typing import List, Optional, Union
+from fastapi import APIRouter, HTTPException, status, Depends, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from pymongo.errors import DuplicateKeyError
+from app.core.config import settings
+from app.schemas.student import StudentCreate, Student, StudentSummary, StudentUpdate, ImportJobStatus
 from app.schemas.user import User
+from app.models.import_job import ImportJobModel
 from app.models.student import StudentModel
-from app.services.ml_service import ml_service
+from app.services.inference_dispatcher import inference_dispatcher
+from app.services.student_export import EXPORT_FORMATS, stream_csv, stream_ndjson
+from app.services.student_import import detect_format, spool_body, start_import, run_import
+from app.utils.pagination import decode_cursor, next_cursor
+from app.utils.responses import STUDENT_FIELDS, resolve_student_fields, student_response, students_response
 from app.utils.dependencies import get_current_active_user
 
 router = APIRouter()
 
+ACADEMIC_FEATURES = [
+    "attendance_percentage",
+    "assessment_score",
+    "assignment_score",
+    "internal_marks",
+    "previous_semester_gpa"
+]
+
+# Re-reads of a student changed by someone else before an update gives up
+UPDATE_ATTEMPTS = 3
+
 
 @router.post("", response_model=Student, status_code=status.HTTP_201_CREATED)
 async def create_student(
@@ -17,14 +36,6 @@ async def create_student(
     """
     Create a new student and auto-predict dropout risk using XGBoost.
     """
-    # Check if roll number already exists
-    existing_student = await StudentModel.get_by_roll_number(student_in.roll_number)
-    if existing_student:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Student with this roll number already exists"
-        )
-    
     # Prepare student data
     student_data = student_in.model_dump()
     
@@ -38,39 +49,191 @@ async def create_student(
             "previous_semester_gpa": student_in.previous_semester_gpa
         }
         
-        dropout_prob, risk_score, risk_level = ml_service.predict_dropout_probability(features)
+        prediction = await inference_dispatcher.predict(features)
         
-        student_data["dropout_probability"] = dropout_prob
-        student_data["risk_score"] = risk_score
-        student_data["risk_level"] = risk_level
+        student_data["dropout_probability"] = prediction["dropout_probability"]
+        student_data["risk_score"] = prediction["risk_score"]
+        student_data["risk_level"] = prediction["risk_level"]
+        student_data["model_version"] = prediction["model_version"]
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error predicting dropout risk: {str(e)}"
         )
     
-    # Create student
-    created_student = await StudentModel.create(student_data)
+    # Create student; the unique roll_number index rejects duplicates, even concurrent ones
+    try:
+        created_student = await StudentModel.create(student_data)
+    except DuplicateKeyError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Student with this roll number already exists"
+        )
     
-    return Student(**created_student)
+    return student_response(created_student, status_code=status.HTTP_201_CREATED)
 
 
-@router.get("", response_model=List[Student])
+@router.get("", response_model=Union[List[Student], List[StudentSummary]])
 async def get_students(
-    skip: int = Query(0, ge=0),
+    skip: int = Query(0, ge=0, description="Legacy offset; prefer cursor for deep pages"),
     limit: int = Query(100, ge=1, le=500),
     risk_level: Optional[str] = Query(None, regex="^(Low|Medium|High)$"),
+    sort_by: str = Query("risk_score", regex="^(risk_score|created_at)$"),
+    order: str = Query("desc", regex="^(asc|desc)$"),
+    cursor: Optional[str] = Query(None, description="Opaque token from the X-Next-Cursor header of the previous page"),
+    fields: Optional[str] = Query(None, description="'summary' or comma-separated fields to return (default: all)"),
     current_user: User = Depends(get_current_active_user)
 ):
     """
     Get all students with risk scores. Supports filtering by risk level.
+    
+    Results are ordered by `sort_by` (ties broken by id). When more results
+    exist, the `X-Next-Cursor` response header holds a token; pass it as
+    `cursor` to fetch the next page at constant cost regardless of depth.
+    
+    `fields=summary` returns the compact StudentSummary (name, roll number,
+    department and risk fields); only the requested fields are read from
+    the database.
+    """
+    try:
+        response_fields = resolve_student_fields(fields)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    
+    filters = {}
+    if risk_level:
+        filters["risk_level"] = risk_level
+    
+    descending = order == "desc"
+    after = None
+    if cursor:
+        try:
+            after = decode_cursor(cursor, sort_by, descending)
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(e)
+            )
+    
+    # Fetch one extra row to know whether another page exists
+    students = await StudentModel.get_page(
+        limit=limit + 1,
+        filters=filters,
+        sort_field=sort_by,
+        descending=descending,
+        after=after,
+        skip=skip,
+        fields=None if response_fields is STUDENT_FIELDS else response_fields
+    )
+    
+    token = next_cursor(students, limit, sort_by, descending)
+    headers = {"X-Next-Cursor": token} if token else None
+    
+    return students_response(students[:limit], headers=headers, fields=response_fields)
+
+
+@router.post("/import", response_model=ImportJobStatus, status_code=status.HTTP_202_ACCEPTED)
+async def import_students(
+    request: Request,
+    response: Response,
+    requested_format: Optional[str] = Query(
+        None, alias="format", regex="^(csv|jsonl)$", description="Defaults to the Content-Type"
+    ),
+    wait: bool = Query(False, description="Process the upload before responding"),
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    Bulk-create students from a streamed CSV (with header) or JSONL body.
+    
+    Rows are validated against the student schema in chunks, each chunk is
+    scored with one model call and written with an unordered bulk insert.
+    The import runs in the background; poll `GET /students/import/{job_id}`
+    for progress and the per-row error report.
+    """
+    upload_format = detect_format(request.headers.get("content-type"), requested_format)
+    if upload_format is None:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail="Send text/csv or application/x-ndjson, or pass ?format=csv|jsonl"
+        )
+    
+    spool = await spool_body(request.stream())
+    job = await ImportJobModel.create({
+        "format": upload_format,
+        "created_by": current_user.username
+    })
+    
+    if wait:
+        await run_import(job["_id"], spool, upload_format)
+        job = await ImportJobModel.get_by_id(job["_id"])
+        response.status_code = status.HTTP_200_OK
+    else:
+        start_import(job["_id"], spool, upload_format)
+    
+    return ImportJobStatus(**job)
+
+
+@router.get("/import/{job_id}", response_model=ImportJobStatus)
+async def get_import_status(
+    job_id: str,
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    Get progress and the per-row error report of a bulk import.
+    """
+    job = await ImportJobModel.get_by_id(job_id)
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Import job not found"
+        )
+    
+    return ImportJobStatus(**job)
+
+
+@router.get("/export")
+async def export_students(
+    export_format: str = Query("ndjson", alias="format", regex="^(ndjson|csv)$"),
+    risk_level: Optional[str] = Query(None, regex="^(Low|Medium|High)$"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to export, or 'summary' (default: all)"),
+    batch_size: Optional[int] = Query(None, ge=1, le=10000, description="Documents per database batch"),
+    current_user: User = Depends(get_current_active_user)
+):
     """
+    Stream all matching students as NDJSON or CSV.
+    
+    Rows are read from a database cursor and written out batch by batch, so
+    memory use does not grow with the size of the collection.
+    """
+    try:
+        # Same field names as the list endpoint; _id is the first column
+        export_fields = ["_id"] + [field for field in resolve_student_fields(fields) if field != "_id"]
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    
     filters = {}
     if risk_level:
         filters["risk_level"] = risk_level
     
-    students = await StudentModel.get_all(skip=skip, limit=limit, filters=filters)
-    return [Student(**student) for student in students]
+    batch_size = batch_size or settings.EXPORT_BATCH_SIZE
+    cursor = StudentModel.iter_export(
+        filters=filters,
+        projection={field: 1 for field in export_fields},
+        batch_size=batch_size
+    )
+    
+    encode = stream_csv if export_format == "csv" else stream_ndjson
+    return StreamingResponse(
+        encode(cursor, export_fields, batch_size),
+        media_type=EXPORT_FORMATS[export_format],
+        headers={"Content-Disposition": f'attachment; filename="students.{export_format}"'}
+    )
 
 
 @router.get("/{student_id}", response_model=Student)
@@ -88,7 +251,7 @@ async def get_student(
             detail="Student not found"
         )
     
-    return Student(**student)
+    return student_response(student)
 
 
 @router.put("/{student_id}", response_model=Student)
@@ -99,60 +262,65 @@ async def update_student(
 ):
     """
     Update student information and recalculate risk if academic data changed.
-    """
-    # Check if student exists
-    existing_student = await StudentModel.get_by_id(student_id)
-    if not existing_student:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Student not found"
-        )
     
-    # Prepare update data
+    An update that touches no academic fields is written in a single round
+    trip. Otherwise the student is read first, the model is re-run only when
+    the feature vector changes, and the write is guarded by the version read
+    so a concurrent change is detected and the update retried.
+    """
     update_data = student_update.model_dump(exclude_unset=True)
     
-    # Check if academic features were updated
-    academic_features = [
-        "attendance_percentage",
-        "assessment_score",
-        "assignment_score",
-        "internal_marks",
-        "previous_semester_gpa"
-    ]
-    
-    academic_updated = any(key in update_data for key in academic_features)
+    if update_data and not any(key in update_data for key in ACADEMIC_FEATURES):
+        updated_student = await StudentModel.update(student_id, update_data)
+        if not updated_student:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Student not found"
+            )
+        return student_response(updated_student)
     
-    if academic_updated:
-        # Get current features and update with new values
-        features = {
-            "attendance_percentage": update_data.get("attendance_percentage", existing_student.get("attendance_percentage")),
-            "assessment_score": update_data.get("assessment_score", existing_student.get("assessment_score")),
-            "assignment_score": update_data.get("assignment_score", existing_student.get("assignment_score")),
-            "internal_marks": update_data.get("internal_marks", existing_student.get("internal_marks")),
-            "previous_semester_gpa": update_data.get("previous_semester_gpa", existing_student.get("previous_semester_gpa"))
+    for _ in range(UPDATE_ATTEMPTS):
+        existing_student = await StudentModel.get_by_id(student_id)
+        if not existing_student:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Student not found"
+            )
+        
+        changes = {
+            key: value for key, value in update_data.items()
+            if existing_student.get(key) != value
         }
+        if not changes:
+            return student_response(existing_student)
         
-        try:
-            dropout_prob, risk_score, risk_level = ml_service.predict_dropout_probability(features)
+        if any(key in changes for key in ACADEMIC_FEATURES):
+            features = {
+                feature: changes.get(feature, existing_student.get(feature))
+                for feature in ACADEMIC_FEATURES
+            }
             
-            update_data["dropout_probability"] = dropout_prob
-            update_data["risk_score"] = risk_score
-            update_data["risk_level"] = risk_level
-        except Exception as e:
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=f"Error predicting dropout risk: {str(e)}"
-            )
-    
-    # Update student
-    updated_student = await StudentModel.update(student_id, update_data)
-    if not updated_student:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to update student"
-        )
+            try:
+                prediction = await inference_dispatcher.predict(features)
+                
+                changes["dropout_probability"] = prediction["dropout_probability"]
+                changes["risk_score"] = prediction["risk_score"]
+                changes["risk_level"] = prediction["risk_level"]
+                changes["model_version"] = prediction["model_version"]
+            except Exception as e:
+                raise HTTPException(
+                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                    detail=f"Error predicting dropout risk: {str(e)}"
+                )
+        
+        updated_student = await StudentModel.update(student_id, changes, existing_student)
+        if updated_student:
+            return student_response(updated_student)
     
-    return Student(**updated_student)
+    raise HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail="Student is being modified concurrently, please retry"
+    )
 
 
 @router.delete("/{student_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -7,19 +7,98 @@ class Settings(BaseSettings):
     # MongoDB
     MONGODB_URL: str = "mongodb://localhost:27017"
     MONGODB_DB_NAME: str = "student_dropout_prediction"
+    RUN_MIGRATIONS_ON_STARTUP: bool = True
+    # Connection pool and timeouts (milliseconds; 0 = no limit, except server selection,
+    # which PyMongo always bounds and must be positive)
+    MONGODB_MAX_POOL_SIZE: int = 100
+    MONGODB_MIN_POOL_SIZE: int = 10
+    MONGODB_MAX_IDLE_TIME_MS: int = 300000
+    MONGODB_CONNECT_TIMEOUT_MS: int = 10000
+    MONGODB_SERVER_SELECTION_TIMEOUT_MS: int = 5000
+    MONGODB_SOCKET_TIMEOUT_MS: int = 0
+    MONGODB_WAIT_QUEUE_TIMEOUT_MS: int = 0
+    # Comma-separated wire compressors in order of preference, e.g. "zstd,snappy,zlib"
+    # (zstd needs the zstandard package and snappy python-snappy; empty = off)
+    MONGODB_COMPRESSORS: str = ""
+    # Read preference for heavy reads that tolerate replication lag (student listings,
+    # analytics, exports): primary, primaryPreferred, secondary, secondaryPreferred or
+    # nearest. Writes and read-after-write lookups always use the primary.
+    MONGODB_HEAVY_READ_PREFERENCE: str = "primary"
+    MONGODB_MAX_STALENESS_SECONDS: int = -1
+    # Ping MongoDB at startup (fail fast) and open MONGODB_MIN_POOL_SIZE connections
+    MONGODB_PING_ON_STARTUP: bool = True
     
     # JWT
     SECRET_KEY: str = "your-secret-key-here-change-in-production"
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     
+    # Authenticated-user cache (size 0 disables)
+    USER_CACHE_SIZE: int = 10000
+    USER_CACHE_TTL_SECONDS: float = 30
+    
+    # Password hashing pool (0 workers = hash on the event loop); calls beyond
+    # PASSWORD_HASH_MAX_PENDING running or queued are rejected with 503
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_PENDING: int = 64
+    
     # Application
     API_V1_STR: str = "/api/v1"
     PROJECT_NAME: str = "Student Dropout Prediction System"
     DEBUG: bool = True
+    # Expose Prometheus metrics at /metrics
+    METRICS_ENABLED: bool = True
+    
+    # Request profiling (off unless enabled): requests sending X-Profile: <PROFILING_TOKEN>
+    # or sampled at PROFILING_SAMPLE_RATE are profiled into PROFILING_DIR
+    PROFILING_ENABLED: bool = False
+    PROFILING_TOKEN: str = ""
+    PROFILING_SAMPLE_RATE: float = 0.0
+    PROFILING_MODE: str = "cprofile"
+    PROFILING_DIR: str = "profiles"
+    PROFILING_MAX_FILES: int = 100
     
     # Model
     MODEL_PATH: str = "models/student_xgboost_model.pkl"
+    MAX_PREDICTION_BATCH_SIZE: int = 5000
+    COMPILE_MODEL: bool = True
+    # Export the compiled trees to this file once and memory-map it in every worker
+    # instead of unpickling the model (empty = off)
+    MODEL_MMAP_PATH: str = ""
+    # Score the canary batch once at startup so the first request is not slow
+    WARM_UP_MODEL: bool = True
+    # risk_factors from per-student SHAP values ("contributions") or from the
+    # global feature importances weighted by feature values ("importance")
+    EXPLANATION_MODE: str = "contributions"
+    
+    # Prediction cache (size 0 disables)
+    PREDICTION_CACHE_SIZE: int = 10000
+    PREDICTION_CACHE_TTL_SECONDS: float = 300
+    PREDICTION_CACHE_DECIMALS: int = 6
+    
+    # Hot reload: poll MODEL_PATH for changes every N seconds (0 disables)
+    MODEL_WATCH_INTERVAL_SECONDS: float = 0
+    
+    # Inference dispatcher
+    INFERENCE_MAX_BATCH_SIZE: int = 64
+    INFERENCE_BATCH_WINDOW_MS: float = 2.0
+    INFERENCE_WORKERS: int = 1
+    
+    # Bulk import
+    IMPORT_CHUNK_SIZE: int = 1000
+    IMPORT_SPOOL_MAX_BYTES: int = 8 * 1024 * 1024
+    IMPORT_MAX_REPORTED_ERRORS: int = 1000
+    
+    # Streaming export (documents fetched per cursor batch)
+    EXPORT_BATCH_SIZE: int = 1000
+    
+    # Bulk re-scoring (0 ops/second = unthrottled)
+    RESCORE_BATCH_SIZE: int = 500
+    RESCORE_MAX_OPS_PER_SECOND: float = 1000
+    RESCORE_STALE_AFTER_SECONDS: float = 300
+    
+    # Usernames allowed to call /admin endpoints
+    ADMIN_USERNAMES: List[str] = []
     
     # CORS
     BACKEND_CORS_ORIGINS: List[str] = [
@@ -34,6 +113,12 @@ class Settings(BaseSettings):
             return [i.strip() for i in v.split(",")]
         return v
     
+    @validator("MONGODB_SERVER_SELECTION_TIMEOUT_MS")
+    def check_server_selection_timeout(cls, v):
+        if v <= 0:
+            raise ValueError("must be positive (0 would fail every operation immediately)")
+        return v
+    
     class Config:
         env_file = ".env"
         case_sensitive = True
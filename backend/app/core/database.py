@@ -1,26 +1,178 @@
+import asyncio
+import threading
+from collections import defaultdict
+from typing import Dict
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import monitoring
+from pymongo.read_preferences import Nearest, Primary, PrimaryPreferred, Secondary, SecondaryPreferred
 from app.core.config import settings
+from app.core.metrics import MongoCommandMetrics
+
+READ_PREFERENCES = {
+    "primary": Primary,
+    "primaryPreferred": PrimaryPreferred,
+    "secondary": Secondary,
+    "secondaryPreferred": SecondaryPreferred,
+    "nearest": Nearest,
+}
+
 
 class Database:
     client: AsyncIOMotorClient = None
     db = None
+    # Same database with MONGODB_HEAVY_READ_PREFERENCE, for reads that tolerate lag
+    read_db = None
 
 
 db = Database()
 
 
+class PoolStats(monitoring.ConnectionPoolListener):
+    """
+    Connection pool counters per server from PyMongo's connection monitoring.
+
+    ``open``, ``in_use`` and ``waiting`` are current values; ``checkouts``,
+    ``checkout_failures`` and ``cleared`` count since startup. Events arrive
+    on driver threads, hence the lock.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.servers: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+
+    def _add(self, event, **deltas):
+        address = "%s:%s" % event.address
+        with self._lock:
+            server = self.servers[address]
+            for key, delta in deltas.items():
+                server[key] += delta
+
+    def pool_created(self, event):
+        self._add(event)
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        self._add(event, cleared=1)
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_created(self, event):
+        self._add(event, open=1)
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        self._add(event, open=-1)
+
+    def connection_check_out_started(self, event):
+        self._add(event, waiting=1)
+
+    def connection_check_out_failed(self, event):
+        self._add(event, waiting=-1, checkout_failures=1)
+
+    def connection_checked_out(self, event):
+        self._add(event, waiting=-1, in_use=1, checkouts=1)
+
+    def connection_checked_in(self, event):
+        self._add(event, in_use=-1)
+
+    def snapshot(self) -> Dict[str, Dict[str, int]]:
+        with self._lock:
+            return {address: dict(counters) for address, counters in self.servers.items()}
+
+
+pool_stats = PoolStats()
+
+
 async def get_database():
     """Get database instance."""
     return db.db
 
 
+def _client_options() -> dict:
+    """MongoClient keyword arguments from settings (0 timeouts other than server selection mean no limit)."""
+    options = {
+        "appname": settings.PROJECT_NAME,
+        "maxPoolSize": settings.MONGODB_MAX_POOL_SIZE,
+        "minPoolSize": settings.MONGODB_MIN_POOL_SIZE,
+        "maxIdleTimeMS": settings.MONGODB_MAX_IDLE_TIME_MS or None,
+        "connectTimeoutMS": settings.MONGODB_CONNECT_TIMEOUT_MS or None,
+        "serverSelectionTimeoutMS": settings.MONGODB_SERVER_SELECTION_TIMEOUT_MS,
+        "socketTimeoutMS": settings.MONGODB_SOCKET_TIMEOUT_MS or None,
+        "waitQueueTimeoutMS": settings.MONGODB_WAIT_QUEUE_TIMEOUT_MS or None,
+    }
+    if settings.MONGODB_COMPRESSORS:
+        options["compressors"] = settings.MONGODB_COMPRESSORS
+    return options
+
+
+def heavy_read_preference():
+    """Read preference for listings, analytics and exports."""
+    mode = READ_PREFERENCES.get(settings.MONGODB_HEAVY_READ_PREFERENCE)
+    if mode is None:
+        raise ValueError(
+            f"Unknown MONGODB_HEAVY_READ_PREFERENCE {settings.MONGODB_HEAVY_READ_PREFERENCE!r}; "
+            f"expected one of {', '.join(READ_PREFERENCES)}"
+        )
+    if mode is Primary:
+        return Primary()
+    return mode(max_staleness=settings.MONGODB_MAX_STALENESS_SECONDS)
+
+
 async def connect_to_mongo():
-    """Create database connection."""
-    db.client = AsyncIOMotorClient(settings.MONGODB_URL)
+    """Create database connection, verify it and open the minimum pool."""
+    event_listeners = [pool_stats]
+    if settings.METRICS_ENABLED:
+        event_listeners.append(MongoCommandMetrics())
+    db.client = AsyncIOMotorClient(settings.MONGODB_URL, event_listeners=event_listeners, **_client_options())
     db.db = db.client[settings.MONGODB_DB_NAME]
+    db.read_db = db.client.get_database(settings.MONGODB_DB_NAME, read_preference=heavy_read_preference())
     print(f"Connected to MongoDB at {settings.MONGODB_URL}")
     print(f"Using database: {settings.MONGODB_DB_NAME}")
 
+    if settings.MONGODB_PING_ON_STARTUP:
+        await warm_up_pool()
+
+
+async def warm_up_pool():
+    """
+    Ping MongoDB (raising if unreachable within the server selection timeout),
+    then run MONGODB_MIN_POOL_SIZE concurrent pings so that many connections
+    are open before the first request instead of being created under load.
+    """
+    await db.client.admin.command("ping")
+    if settings.MONGODB_MIN_POOL_SIZE > 1:
+        await asyncio.gather(*[
+            db.client.admin.command("ping") for _ in range(settings.MONGODB_MIN_POOL_SIZE)
+        ])
+    print(f"MongoDB ping OK, {settings.MONGODB_MIN_POOL_SIZE} pooled connection(s) warmed up")
+
+
+async def ping_mongo(timeout_seconds: float = 2.0) -> bool:
+    """Whether MongoDB answers a ping within timeout_seconds."""
+    if db.client is None:
+        return False
+    try:
+        await asyncio.wait_for(db.client.admin.command("ping"), timeout_seconds)
+        return True
+    except Exception:
+        return False
+
+
+def get_pool_stats() -> dict:
+    """Pool configuration and per-server connection counters for monitoring."""
+    return {
+        "max_pool_size": settings.MONGODB_MAX_POOL_SIZE,
+        "min_pool_size": settings.MONGODB_MIN_POOL_SIZE,
+        "compressors": settings.MONGODB_COMPRESSORS.split(",") if settings.MONGODB_COMPRESSORS else [],
+        "heavy_read_preference": settings.MONGODB_HEAVY_READ_PREFERENCE,
+        "servers": pool_stats.snapshot(),
+    }
+
 
 async def close_mongo_connection():
     """Close database connection."""
@@ -0,0 +1,139 @@
+"""
+Prometheus metrics: HTTP requests, model inference, MongoDB commands and
+connection pools.
+
+Routes are labelled by their path template (``/api/v1/students/{student_id}``),
+never the raw URL, so label cardinality stays bounded. Mongo command
+durations come from PyMongo's command monitoring, which reports the duration
+with each event, so no per-command state is kept. Pool gauges are read from
+app.core.database.pool_stats at scrape time.
+"""
+
+import time
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, Counter, Histogram, generate_latest
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+from pymongo import monitoring
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024, 2048, 5000)
+
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route",
+    ["method", "route"],
+    buckets=LATENCY_BUCKETS,
+)
+HTTP_REQUESTS = Counter(
+    "http_requests_total",
+    "HTTP responses by route and status code",
+    ["method", "route", "status"],
+)
+MODEL_INFERENCE_DURATION = Histogram(
+    "model_inference_duration_seconds",
+    "Duration of one model call (a whole batch)",
+    ["operation"],
+    buckets=LATENCY_BUCKETS,
+)
+MODEL_INFERENCE_BATCH_SIZE = Histogram(
+    "model_inference_batch_size",
+    "Rows scored per model call",
+    ["operation"],
+    buckets=BATCH_SIZE_BUCKETS,
+)
+MONGO_COMMAND_DURATION = Histogram(
+    "mongodb_command_duration_seconds",
+    "MongoDB command duration by command name and outcome",
+    ["command", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+
+
+def observe_inference(operation: str, rows: int, started: float):
+    """Record one model call that began at time.perf_counter() value started."""
+    MODEL_INFERENCE_DURATION.labels(operation).observe(time.perf_counter() - started)
+    MODEL_INFERENCE_BATCH_SIZE.labels(operation).observe(rows)
+
+
+class MongoCommandMetrics(monitoring.CommandListener):
+    """PyMongo command listener recording command durations."""
+
+    def started(self, event):
+        pass
+
+    def succeeded(self, event):
+        MONGO_COMMAND_DURATION.labels(event.command_name, "succeeded").observe(event.duration_micros / 1e6)
+
+    def failed(self, event):
+        MONGO_COMMAND_DURATION.labels(event.command_name, "failed").observe(event.duration_micros / 1e6)
+
+
+class MongoPoolCollector:
+    """Exports the connection pool counters kept by app.core.database.pool_stats."""
+
+    @staticmethod
+    def _families():
+        connections = GaugeMetricFamily(
+            "mongodb_pool_connections",
+            "MongoDB pool connections by state (open, in_use, waiting)",
+            labels=["address", "state"],
+        )
+        checkouts = CounterMetricFamily(
+            "mongodb_pool_checkouts",
+            "MongoDB pool checkouts by outcome",
+            labels=["address", "outcome"],
+        )
+        return connections, checkouts
+
+    def describe(self):
+        return self._families()
+
+    def collect(self):
+        from app.core.database import pool_stats
+
+        connections, checkouts = self._families()
+        for address, counters in pool_stats.snapshot().items():
+            for state in ("open", "in_use", "waiting"):
+                connections.add_metric([address, state], counters.get(state, 0))
+            checkouts.add_metric([address, "succeeded"], counters.get("checkouts", 0))
+            checkouts.add_metric([address, "failed"], counters.get("checkout_failures", 0))
+        yield connections
+        yield checkouts
+
+
+REGISTRY.register(MongoPoolCollector())
+
+
+class MetricsMiddleware:
+    """ASGI middleware timing each HTTP request and counting status codes."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            # The router stores the matched route in the scope; unmatched paths share one label
+            route = scope.get("route")
+            route_path = getattr(route, "path", None) or "unmatched"
+            method = scope["method"]
+            HTTP_REQUEST_DURATION.labels(method, route_path).observe(time.perf_counter() - started)
+            HTTP_REQUESTS.labels(method, route_path, str(status_code)).inc()
+
+
+def render_metrics() -> tuple:
+    """Body and content type of the Prometheus exposition."""
+    return generate_latest(), CONTENT_TYPE_LATEST
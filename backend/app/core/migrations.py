@@ -0,0 +1,254 @@
+"""
+Versioned index/migration registry.
+
+Each Migration declares the indexes it creates (per collection) and an
+optional data step. Pending migrations are applied in version order at
+startup and recorded in the ``schema_migrations`` collection. A dry run
+reports what would be applied and, via ``explain``, which registered queries
+are collection scans today and become index-backed afterwards.
+
+    python -m app.core.migrations            # apply pending migrations
+    python -m app.core.migrations --dry-run  # report only
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, NamedTuple, Optional
+from pymongo import ASCENDING, DESCENDING, IndexModel
+from pymongo.errors import DuplicateKeyError, PyMongoError
+from app.core.database import db
+from app.models.student_summary import StudentSummaryModel
+
+MIGRATIONS_COLLECTION = "schema_migrations"
+
+
+class Migration(NamedTuple):
+    version: int
+    description: str
+    indexes: Dict[str, List[IndexModel]] = {}
+    apply: Optional[Callable[[Any], Awaitable[None]]] = None
+
+
+class QueryProbe(NamedTuple):
+    """A query the application issues, used to check index coverage."""
+    name: str
+    collection: str
+    filter: dict
+    sort: Optional[List[tuple]] = None
+
+
+def _drop_index(collection: str, name: str) -> Callable[[Any], Awaitable[None]]:
+    """Data step dropping an index superseded by a later migration (if present)."""
+    async def apply(database):
+        existing = await database[collection].index_information()
+        if name in existing:
+            await database[collection].drop_index(name)
+    return apply
+
+
+MIGRATIONS: List[Migration] = [
+    Migration(
+        version=1,
+        description="Unique keys for students and users; risk and department listing indexes",
+        indexes={
+            "students": [
+                IndexModel([("roll_number", ASCENDING)], name="roll_number_unique", unique=True),
+                IndexModel([("risk_level", ASCENDING), ("risk_score", DESCENDING)], name="risk_level_risk_score"),
+                IndexModel([("department", ASCENDING), ("semester", ASCENDING)], name="department_semester"),
+            ],
+            "users": [
+                IndexModel([("username", ASCENDING)], name="username_unique", unique=True),
+                IndexModel([("email", ASCENDING)], name="email_unique", unique=True),
+            ],
+        },
+    ),
+    Migration(
+        version=2,
+        description="Keyset pagination indexes for student listing (sort key + _id)",
+        indexes={
+            "students": [
+                IndexModel([("risk_score", DESCENDING), ("_id", DESCENDING)], name="risk_score_id"),
+                IndexModel(
+                    [("risk_level", ASCENDING), ("risk_score", DESCENDING), ("_id", DESCENDING)],
+                    name="risk_level_risk_score_id"
+                ),
+                IndexModel([("created_at", DESCENDING), ("_id", DESCENDING)], name="created_at_id"),
+            ],
+        },
+        apply=_drop_index("students", "risk_level_risk_score"),
+    ),
+    Migration(
+        version=3,
+        description="Materialized risk summaries per department and semester",
+        apply=lambda database: StudentSummaryModel.rebuild(),
+    ),
+]
+
+QUERY_PROBES: List[QueryProbe] = [
+    QueryProbe("students by roll_number", "students", {"roll_number": "__probe__"}),
+    QueryProbe(
+        "students by risk_level", "students", {"risk_level": "High"},
+        [("risk_score", DESCENDING), ("_id", DESCENDING)]
+    ),
+    QueryProbe("students listing by risk_score", "students", {}, [("risk_score", DESCENDING), ("_id", DESCENDING)]),
+    QueryProbe("students listing by created_at", "students", {}, [("created_at", DESCENDING), ("_id", DESCENDING)]),
+    QueryProbe("students by department and semester", "students", {"department": "__probe__", "semester": 1}),
+    QueryProbe("users by username", "users", {"username": "__probe__"}),
+    QueryProbe("users by email", "users", {"email": "__probe__"}),
+]
+
+
+async def get_applied_versions() -> List[int]:
+    """Versions already recorded in the migrations collection."""
+    cursor = db.db[MIGRATIONS_COLLECTION].find({}, {"_id": 1})
+    return sorted([record["_id"] async for record in cursor])
+
+
+def _index_fields(index: IndexModel) -> List[str]:
+    return list(index.document["key"].keys())
+
+
+def _plan_stages(plan: Any) -> List[str]:
+    """All stage names in an explain plan tree."""
+    stages = []
+    if isinstance(plan, dict):
+        if "stage" in plan:
+            stages.append(plan["stage"])
+        for value in plan.values():
+            stages.extend(_plan_stages(value))
+    elif isinstance(plan, list):
+        for value in plan:
+            stages.extend(_plan_stages(value))
+    return stages
+
+
+async def _explain_probe(probe: QueryProbe) -> str:
+    """IXSCAN, COLLSCAN or unknown for a probe against the current indexes."""
+    try:
+        cursor = db.db[probe.collection].find(probe.filter)
+        if probe.sort:
+            cursor = cursor.sort(probe.sort)
+        plan = (await cursor.explain()).get("queryPlanner", {}).get("winningPlan", {})
+    except Exception:
+        return "unknown"
+
+    stages = _plan_stages(plan)
+    if any(stage in ("IXSCAN", "EXPRESS_IXSCAN", "IDHACK") for stage in stages):
+        return "IXSCAN"
+    if "COLLSCAN" in stages:
+        return "COLLSCAN"
+    return "unknown"
+
+
+def _covering_index(probe: QueryProbe, migrations: List[Migration]) -> Optional[str]:
+    """Name of a declared index whose leading fields match the probe's filter (then sort) fields."""
+    n_filter = len(probe.filter)
+    sort_fields = [field for field, _ in (probe.sort or [])]
+    for migration in migrations:
+        for index in migration.indexes.get(probe.collection, []):
+            fields = _index_fields(index)
+            if (set(fields[:n_filter]) == set(probe.filter)
+                    and fields[n_filter:n_filter + len(sort_fields)] == sort_fields):
+                return index.document["name"]
+    return None
+
+
+async def explain_queries(pending: List[Migration]) -> List[Dict[str, Any]]:
+    """Report the current plan of each probe and whether pending migrations index it."""
+    report = []
+    for probe in QUERY_PROBES:
+        current = await _explain_probe(probe)
+        report.append({
+            "query": probe.name,
+            "collection": probe.collection,
+            "current_plan": current,
+            "index_after_migration": _covering_index(probe, MIGRATIONS) if current != "IXSCAN" else None,
+            "added_by_pending": _covering_index(probe, pending) is not None,
+        })
+    return report
+
+
+async def run_migrations(dry_run: bool = False) -> Dict[str, Any]:
+    """
+    Apply pending migrations in version order (or only report them).
+
+    A migration whose index build or data step fails is not recorded, so it
+    is retried on the next startup; later migrations are not applied.
+
+    Returns:
+        Report with applied/pending versions and, for dry runs, query plans
+    """
+    applied_versions = set(await get_applied_versions())
+    pending = [m for m in sorted(MIGRATIONS, key=lambda m: m.version) if m.version not in applied_versions]
+
+    report: Dict[str, Any] = {
+        "dry_run": dry_run,
+        "applied_versions": sorted(applied_versions),
+        "pending": [
+            {
+                "version": m.version,
+                "description": m.description,
+                "indexes": {
+                    collection: [index.document["name"] for index in indexes]
+                    for collection, indexes in m.indexes.items()
+                },
+            }
+            for m in pending
+        ],
+        "newly_applied": [],
+    }
+
+    if dry_run:
+        report["queries"] = await explain_queries(pending)
+        return report
+
+    for migration in pending:
+        started = time.perf_counter()
+        try:
+            for collection, indexes in migration.indexes.items():
+                await db.db[collection].create_indexes(indexes)
+            if migration.apply is not None:
+                await migration.apply(db.db)
+        except PyMongoError as e:
+            # Left unrecorded so the next startup retries it; /ready reports it meanwhile
+            print(f"Migration {migration.version} failed ({migration.description}): {e}")
+            report["error"] = {"version": migration.version, "message": str(e)}
+            break
+
+        try:
+            await db.db[MIGRATIONS_COLLECTION].insert_one({
+                "_id": migration.version,
+                "description": migration.description,
+                "applied_at": datetime.utcnow(),
+                "duration_ms": round((time.perf_counter() - started) * 1000, 1),
+            })
+        except DuplicateKeyError:
+            # Another worker recorded it concurrently; index builds are idempotent
+            pass
+        report["newly_applied"].append(migration.version)
+        print(f"Applied migration {migration.version}: {migration.description}")
+
+    return report
+
+
+async def _main(dry_run: bool):
+    from app.core.database import connect_to_mongo, close_mongo_connection
+
+    await connect_to_mongo()
+    try:
+        print(json.dumps(await run_migrations(dry_run=dry_run), indent=2, default=str))
+    finally:
+        await close_mongo_connection()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Apply or preview database index migrations.")
+    parser.add_argument("--dry-run", action="store_true", help="Report pending migrations and query plans only")
+    asyncio.run(_main(parser.parse_args().dry_run))
+
+
+if __name__ == "__main__":
+    main()
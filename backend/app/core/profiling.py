@@ -0,0 +1,171 @@
+"""
+Opt-in request profiling.
+
+When PROFILING_ENABLED is set, a request is profiled if it carries
+``X-Profile: <PROFILING_TOKEN>`` or is picked by PROFILING_SAMPLE_RATE.
+Profiles are written to PROFILING_DIR (oldest deleted beyond
+PROFILING_MAX_FILES); an authorized request may send
+``X-Profile-Output: inline`` to get the report as the response body instead.
+
+Two profilers are supported: ``cprofile`` (standard library; .prof files for
+pstats/snakeviz, counts only time the handler runs on the loop) and
+``pyinstrument`` (optional, statistical; async-aware, so time awaiting Motor
+is attributed to the awaiting line). Only one request is profiled at a time
+because both profilers hook the whole event loop thread, so other requests
+running concurrently can show up in a profile. When profiling is disabled
+the middleware is not installed at all.
+"""
+
+import asyncio
+import cProfile
+import hmac
+import io
+import pstats
+import random
+import re
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Optional, Tuple
+from app.core.config import settings
+
+
+class _CProfileRecorder:
+    extension = "prof"
+
+    def __init__(self):
+        self._profile = cProfile.Profile()
+
+    def start(self):
+        self._profile.enable()
+
+    def stop(self):
+        self._profile.disable()
+
+    def save(self, path: Path):
+        self._profile.dump_stats(str(path))
+
+    def render_text(self) -> str:
+        output = io.StringIO()
+        pstats.Stats(self._profile, stream=output).sort_stats("cumulative").print_stats(60)
+        return output.getvalue()
+
+
+class _PyinstrumentRecorder:
+    extension = "html"
+
+    def __init__(self):
+        from pyinstrument import Profiler
+
+        self._profiler = Profiler(interval=0.001, async_mode="enabled")
+
+    def start(self):
+        self._profiler.start()
+
+    def stop(self):
+        self._profiler.stop()
+
+    def save(self, path: Path):
+        path.write_text(self._profiler.output_html())
+
+    def render_text(self) -> str:
+        return self._profiler.output_text(unicode=True)
+
+
+def _make_recorder():
+    if settings.PROFILING_MODE == "pyinstrument":
+        try:
+            return _PyinstrumentRecorder()
+        except ImportError:
+            print("Warning: pyinstrument is not installed; profiling with cProfile")
+    return _CProfileRecorder()
+
+
+class ProfilingMiddleware:
+    """ASGI middleware profiling selected requests end to end."""
+
+    def __init__(self, app):
+        self.app = app
+        self.directory = Path(settings.PROFILING_DIR)
+        self._busy = False
+
+    def _wanted(self, scope) -> Tuple[bool, bool]:
+        """(profile this request, return the report inline)."""
+        headers = dict(scope.get("headers") or [])
+        token = headers.get(b"x-profile")
+        if token is not None and settings.PROFILING_TOKEN and hmac.compare_digest(
+            token, settings.PROFILING_TOKEN.encode()
+        ):
+            return True, headers.get(b"x-profile-output") == b"inline"
+        if settings.PROFILING_SAMPLE_RATE > 0 and random.random() < settings.PROFILING_SAMPLE_RATE:
+            return True, False
+        return False, False
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        wanted, inline = self._wanted(scope)
+        if not wanted or self._busy:
+            await self.app(scope, receive, send)
+            return
+
+        self._busy = True
+        recorder = _make_recorder()
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            # Inline reports replace the handler's response
+            if not inline:
+                await send(message)
+
+        started = time.perf_counter()
+        recorder.start()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            recorder.stop()
+            self._busy = False
+
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        path = await asyncio.to_thread(self._save, recorder, scope, status_code, elapsed_ms)
+        if inline:
+            await self._send_report(send, recorder, status_code, elapsed_ms, path)
+
+    def _save(self, recorder, scope, status_code: int, elapsed_ms: float) -> Optional[Path]:
+        """Write the profile and drop the oldest files beyond PROFILING_MAX_FILES."""
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            route = getattr(scope.get("route"), "path", None) or scope["path"]
+            slug = re.sub(r"[^A-Za-z0-9]+", "_", route).strip("_")[:80] or "root"
+            name = (f"{datetime.utcnow():%Y%m%dT%H%M%S%f}_{scope['method']}_{slug}_"
+                    f"{status_code}_{elapsed_ms:.0f}ms.{recorder.extension}")
+            path = self.directory / name
+            recorder.save(path)
+
+            profiles = sorted(self.directory.glob("*.*"), key=lambda p: p.stat().st_mtime)
+            for old in profiles[:max(0, len(profiles) - settings.PROFILING_MAX_FILES)]:
+                old.unlink(missing_ok=True)
+            return path
+        except Exception as e:
+            print(f"Failed to save profile: {e}")
+            return None
+
+    @staticmethod
+    async def _send_report(send, recorder, status_code: int, elapsed_ms: float, path: Optional[Path]):
+        """Replace the response with the text report; the original status is in a header."""
+        body = recorder.render_text().encode()
+        headers = [
+            (b"content-type", b"text/plain; charset=utf-8"),
+            (b"content-length", str(len(body)).encode()),
+            (b"x-profile-status", str(status_code).encode()),
+            (b"x-profile-elapsed-ms", f"{elapsed_ms:.1f}".encode()),
+        ]
+        if path is not None:
+            headers.append((b"x-profile-file", path.name.encode()))
+        await send({"type": "http.response.start", "status": 200, "headers": headers})
+        await send({"type": "http.response.body", "body": body})
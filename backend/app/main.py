@@ -1,9 +1,25 @@
-from fastapi import FastAPI
+import time
+
+_import_started = time.perf_counter()
+
+import asyncio
+from fastapi import FastAPI, Response, status
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 from app.core.config import settings
-from app.core.database import connect_to_mongo, close_mongo_connection
+from app.core.database import connect_to_mongo, close_mongo_connection, ping_mongo
+from app.core.metrics import MetricsMiddleware, render_metrics
+from app.core.profiling import ProfilingMiddleware
+from app.core.migrations import run_migrations
+from app.services.inference_dispatcher import inference_dispatcher
+from app.services.ml_service import ml_service
+from app.services.model_watcher import model_watcher
+from app.services.password_hasher import password_hasher
 from app.api.v1.api import api_router
+from app.utils.responses import FastJSONResponse
+
+# Time spent importing the application (heavy ML libraries load later, in lifespan)
+IMPORT_MS = round((time.perf_counter() - _import_started) * 1000, 1)
 
 
 @asynccontextmanager
@@ -13,13 +29,37 @@ async def lifespan(app: FastAPI):
     """
     # Startup
     print("Starting up...")
+    timings = {"import_ms": IMPORT_MS}
+    app.state.startup_timings = timings
+    started = time.perf_counter()
+    
+    def mark(step: str):
+        nonlocal started
+        timings[f"{step}_ms"] = round((time.perf_counter() - started) * 1000, 1)
+        started = time.perf_counter()
+    
     await connect_to_mongo()
-    print("Application started successfully!")
+    mark("mongo_connect")
+    app.state.migration_error = None
+    if settings.RUN_MIGRATIONS_ON_STARTUP:
+        app.state.migration_error = (await run_migrations()).get("error")
+        mark("migrations")
+    await asyncio.to_thread(ml_service.load_model)
+    mark("model_load")
+    if settings.WARM_UP_MODEL:
+        await asyncio.to_thread(ml_service.warm_up)
+        mark("model_warm_up")
+    await inference_dispatcher.start()
+    await model_watcher.start()
+    print(f"Application started successfully! ({', '.join(f'{k} {v}' for k, v in timings.items())})")
     
     yield
     
     # Shutdown
     print("Shutting down...")
+    await model_watcher.stop()
+    await inference_dispatcher.stop()
+    password_hasher.shutdown()
     await close_mongo_connection()
     print("Application shut down successfully!")
 
@@ -29,6 +69,7 @@ app = FastAPI(
     title=settings.PROJECT_NAME,
     openapi_url=f"{settings.API_V1_STR}/openapi.json",
     lifespan=lifespan,
+    default_response_class=FastJSONResponse,
     version="1.0.0",
     description="""
     ## AI-Based Student Dropout Prediction & Counseling System
@@ -60,8 +101,15 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
+if settings.PROFILING_ENABLED:
+    app.add_middleware(ProfilingMiddleware)
+
 # Include API router
 app.include_router(api_router, prefix=settings.API_V1_STR)
 
@@ -85,3 +133,34 @@ async def health_check():
         "status": "healthy",
         "service": "Student Dropout Prediction System"
     }
+
+
+@app.get("/ready")
+async def readiness_check(response: Response):
+    """
+    Readiness probe: 200 once the model is loaded, MongoDB answers a ping and
+    the startup migrations applied, 503 otherwise. Unlike /health, use this to
+    gate traffic to a new worker.
+    """
+    model_ready = ml_service.ready
+    mongo_ready = await ping_mongo()
+    migration_error = getattr(app.state, "migration_error", None)
+    ready = model_ready and mongo_ready and migration_error is None
+    if not ready:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    
+    return {
+        "status": "ready" if ready else "not ready",
+        "model": {"ready": model_ready, "version": ml_service.model_version},
+        "mongodb": {"ready": mongo_ready},
+        "migrations": {"ready": migration_error is None, "error": migration_error},
+        "startup_timings": getattr(app.state, "startup_timings", {})
+    }
+
+
+if settings.METRICS_ENABLED:
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics():
+        """Prometheus metrics."""
+        body, content_type = render_metrics()
+        return Response(content=body, media_type=content_type)
@@ -0,0 +1,68 @@
+from datetime import datetime
+from typing import Optional, List
+from bson import ObjectId
+from app.core.database import db
+
+
+class ImportJobModel:
+    """Bulk import job progress, stored so any worker can answer polling requests."""
+    
+    collection_name = "import_jobs"
+    
+    @staticmethod
+    async def create(job_data: dict) -> dict:
+        """Create a new import job."""
+        job_data["status"] = "pending"
+        job_data["processed_rows"] = 0
+        job_data["inserted_count"] = 0
+        job_data["error_count"] = 0
+        job_data["errors"] = []
+        job_data["created_at"] = datetime.utcnow()
+        job_data["updated_at"] = datetime.utcnow()
+        job_data["finished_at"] = None
+        
+        result = await db.db[ImportJobModel.collection_name].insert_one(job_data)
+        job_data["_id"] = str(result.inserted_id)
+        return job_data
+    
+    @staticmethod
+    async def get_by_id(job_id: str) -> Optional[dict]:
+        """Get import job by ID."""
+        if not ObjectId.is_valid(job_id):
+            return None
+        
+        job = await db.db[ImportJobModel.collection_name].find_one({"_id": ObjectId(job_id)})
+        if job:
+            job["_id"] = str(job["_id"])
+        return job
+    
+    @staticmethod
+    async def record_progress(
+        job_id: str,
+        processed_rows: int,
+        inserted_count: int,
+        errors: List[dict],
+        max_errors: int
+    ):
+        """Add one chunk's counts and (up to max_errors overall) row errors."""
+        update = {
+            "$set": {"status": "running", "updated_at": datetime.utcnow()},
+            "$inc": {
+                "processed_rows": processed_rows,
+                "inserted_count": inserted_count,
+                "error_count": len(errors)
+            }
+        }
+        if errors:
+            update["$push"] = {"errors": {"$each": errors, "$slice": max_errors}}
+        
+        await db.db[ImportJobModel.collection_name].update_one({"_id": ObjectId(job_id)}, update)
+    
+    @staticmethod
+    async def finish(job_id: str, status: str, message: Optional[str] = None):
+        """Mark an import job as completed or failed."""
+        now = datetime.utcnow()
+        await db.db[ImportJobModel.collection_name].update_one(
+            {"_id": ObjectId(job_id)},
+            {"$set": {"status": status, "message": message, "updated_at": now, "finished_at": now}}
+        )
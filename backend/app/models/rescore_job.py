@@ -0,0 +1,92 @@
+from datetime import datetime, timedelta
+from typing import Optional
+from bson import ObjectId
+from pymongo import ReturnDocument
+from app.core.database import db
+
+
+class RescoreJobModel:
+    """Re-score job checkpoints, so an interrupted job can resume where it stopped."""
+    
+    collection_name = "rescore_jobs"
+    
+    @staticmethod
+    def _serialize(job: Optional[dict]) -> Optional[dict]:
+        if job:
+            job["_id"] = str(job["_id"])
+            if job.get("last_id") is not None:
+                job["last_id"] = str(job["last_id"])
+        return job
+    
+    @staticmethod
+    async def create(job_data: dict) -> dict:
+        """Create a new re-score job."""
+        job_data["status"] = "pending"
+        job_data["last_id"] = None
+        job_data["processed_count"] = 0
+        job_data["updated_count"] = 0
+        job_data["skipped_count"] = 0
+        job_data["conflict_count"] = 0
+        job_data["created_at"] = datetime.utcnow()
+        job_data["updated_at"] = datetime.utcnow()
+        job_data["heartbeat_at"] = None
+        job_data["finished_at"] = None
+        
+        result = await db.db[RescoreJobModel.collection_name].insert_one(job_data)
+        job_data["_id"] = str(result.inserted_id)
+        return job_data
+    
+    @staticmethod
+    async def get_by_id(job_id: str) -> Optional[dict]:
+        """Get re-score job by ID."""
+        if not ObjectId.is_valid(job_id):
+            return None
+        
+        job = await db.db[RescoreJobModel.collection_name].find_one({"_id": ObjectId(job_id)})
+        return RescoreJobModel._serialize(job)
+    
+    @staticmethod
+    async def claim(job_id: str, stale_after_seconds: float) -> Optional[dict]:
+        """
+        Mark a job as running if it is not completed and no live runner owns it
+        (a running job whose heartbeat is older than stale_after_seconds is
+        considered abandoned). Returns the raw job with an ObjectId last_id.
+        """
+        if not ObjectId.is_valid(job_id):
+            return None
+        
+        now = datetime.utcnow()
+        return await db.db[RescoreJobModel.collection_name].find_one_and_update(
+            {
+                "_id": ObjectId(job_id),
+                "status": {"$ne": "completed"},
+                "$or": [
+                    {"status": {"$ne": "running"}},
+                    {"heartbeat_at": {"$lt": now - timedelta(seconds=stale_after_seconds)}}
+                ]
+            },
+            {"$set": {"status": "running", "heartbeat_at": now, "updated_at": now, "message": None}},
+            return_document=ReturnDocument.AFTER
+        )
+    
+    @staticmethod
+    async def checkpoint(job_id: str, last_id: ObjectId, processed: int, updated: int, skipped: int, conflicts: int = 0):
+        """Record a finished batch and the last student _id it covered."""
+        now = datetime.utcnow()
+        await db.db[RescoreJobModel.collection_name].update_one(
+            {"_id": ObjectId(job_id)},
+            {
+                "$set": {"last_id": last_id, "heartbeat_at": now, "updated_at": now},
+                "$inc": {"processed_count": processed, "updated_count": updated, "skipped_count": skipped,
+                         "conflict_count": conflicts}
+            }
+        )
+    
+    @staticmethod
+    async def finish(job_id: str, status: str, message: Optional[str] = None):
+        """Mark a re-score job as completed, failed or interrupted."""
+        now = datetime.utcnow()
+        await db.db[RescoreJobModel.collection_name].update_one(
+            {"_id": ObjectId(job_id)},
+            {"$set": {"status": status, "message": message, "updated_at": now, "finished_at": now}}
+        )
@@ -1,7 +1,12 @@
+import asyncio
 from datetime import datetime
-from typing import Optional, List
+from typing import Optional, List, Tuple
 from bson import ObjectId
+from pymongo import ReturnDocument
+from pymongo.errors import BulkWriteError
 from app.core.database import db
+from app.models.student_summary import SUMMARY_FEATURES, StudentSummaryModel
+from app.utils.pagination import keyset_filter, sort_spec
 
 
 class StudentModel:
@@ -9,16 +14,137 @@ class StudentModel:
     
     collection_name = "students"
     
+    # Fields the analytics summaries are computed from
+    summary_fields = ["department", "semester", "risk_level", "risk_score"] + SUMMARY_FEATURES
+    
+    @staticmethod
+    async def _update_summaries(changes: List[Tuple[Optional[dict], Optional[dict]]]):
+        """Apply (before, after) changes to the analytics summaries; rebuild repairs any failure."""
+        try:
+            await StudentSummaryModel.apply_changes(changes)
+        except Exception as e:
+            print(f"Failed to update student summaries: {e}")
+    
     @staticmethod
     async def create(student_data: dict) -> dict:
-        """Create a new student."""
+        """
+        Create a new student with one insert (no prior lookup), followed by
+        the summary $inc.
+        
+        Raises:
+            DuplicateKeyError: If the roll number is taken (unique index)
+        """
         student_data["created_at"] = datetime.utcnow()
         student_data["updated_at"] = datetime.utcnow()
         
         result = await db.db[StudentModel.collection_name].insert_one(student_data)
         student_data["_id"] = str(result.inserted_id)
+        await StudentModel._update_summaries([(None, student_data)])
         return student_data
     
+    @staticmethod
+    async def create_many(students_data: List[dict]) -> Tuple[int, List[Tuple[int, str]]]:
+        """
+        Insert many students in one unordered bulk write.
+        
+        Returns:
+            Tuple of (inserted_count, [(index, error message), ...]) where
+            index refers to the position in students_data
+        """
+        if not students_data:
+            return 0, []
+        
+        now = datetime.utcnow()
+        for student_data in students_data:
+            student_data["created_at"] = now
+            student_data["updated_at"] = now
+        
+        try:
+            result = await db.db[StudentModel.collection_name].insert_many(students_data, ordered=False)
+            inserted_count, errors = len(result.inserted_ids), []
+        except BulkWriteError as e:
+            errors = [(error["index"], error["errmsg"]) for error in e.details.get("writeErrors", [])]
+            inserted_count = e.details.get("nInserted", 0)
+        
+        failed = {index for index, _ in errors}
+        await StudentModel._update_summaries([
+            (None, student_data) for index, student_data in enumerate(students_data) if index not in failed
+        ])
+        return inserted_count, errors
+    
+    @staticmethod
+    async def get_existing_roll_numbers(roll_numbers: List[str]) -> set:
+        """Return which of the given roll numbers are already stored."""
+        cursor = db.db[StudentModel.collection_name].find(
+            {"roll_number": {"$in": roll_numbers}},
+            {"roll_number": 1, "_id": 0}
+        )
+        return {student["roll_number"] async for student in cursor}
+    
+    @staticmethod
+    def iter_after_id(
+        last_id: Optional[ObjectId] = None,
+        filters: dict = None,
+        projection: dict = None,
+        batch_size: int = 500
+    ):
+        """
+        Async cursor over students in ascending _id order, starting after last_id.
+        Documents keep their raw ObjectId so callers can checkpoint on it.
+        """
+        query = dict(filters) if filters else {}
+        if last_id is not None:
+            query["_id"] = {"$gt": last_id}
+        
+        return db.db[StudentModel.collection_name].find(query, projection).sort("_id", 1).batch_size(batch_size)
+    
+    @staticmethod
+    def iter_export(filters: dict = None, projection: dict = None, batch_size: int = 1000):
+        """
+        Async cursor over matching students in _id order for streaming exports.
+        Documents are returned raw (ObjectId/datetime values are not converted).
+        Read with MONGODB_HEAVY_READ_PREFERENCE.
+        """
+        query = filters if filters else {}
+        return db.read_db[StudentModel.collection_name].find(query, projection).sort("_id", 1).batch_size(batch_size)
+    
+    @staticmethod
+    async def bulk_set(updates: List[Tuple[ObjectId, dict, Optional[int]]]) -> Tuple[int, int]:
+        """
+        Apply many $set updates concurrently.
+        
+        Each update is (student_id, fields, version) and only applies while
+        the student's version is still the one it was read at (None matches
+        documents without a version); applied updates bump the version. Each
+        is a find_one_and_update returning the document it replaced, so the
+        analytics summaries only follow writes that actually matched.
+        
+        Returns:
+            Tuple of (modified count, updates skipped because the student
+            changed or disappeared since it was read)
+        """
+        if not updates:
+            return 0, 0
+        
+        collection = db.db[StudentModel.collection_name]
+        projection = {field: 1 for field in StudentModel.summary_fields}
+        replaced = await asyncio.gather(*[
+            collection.find_one_and_update(
+                {"_id": student_id, "version": version},
+                {"$set": fields, "$inc": {"version": 1}},
+                projection=projection,
+                return_document=ReturnDocument.BEFORE
+            )
+            for student_id, fields, version in updates
+        ])
+        changes = [
+            (before, {**before, **fields})
+            for before, (_, fields, _) in zip(replaced, updates)
+            if before is not None
+        ]
+        await StudentModel._update_summaries(changes)
+        return len(changes), len(updates) - len(changes)
+    
     @staticmethod
     async def get_by_id(student_id: str) -> Optional[dict]:
         """Get student by ID."""
@@ -30,14 +156,6 @@ class StudentModel:
             student["_id"] = str(student["_id"])
         return student
     
-    @staticmethod
-    async def get_by_roll_number(roll_number: str) -> Optional[dict]:
-        """Get student by roll number."""
-        student = await db.db[StudentModel.collection_name].find_one({"roll_number": roll_number})
-        if student:
-            student["_id"] = str(student["_id"])
-        return student
-    
     @staticmethod
     async def get_all(skip: int = 0, limit: int = 100, filters: dict = None) -> List[dict]:
         """Get all students with pagination and filters."""
@@ -52,21 +170,82 @@ class StudentModel:
         return students
     
     @staticmethod
-    async def update(student_id: str, update_data: dict) -> Optional[dict]:
-        """Update student information."""
+    async def get_page(
+        limit: int = 100,
+        filters: dict = None,
+        sort_field: str = "risk_score",
+        descending: bool = True,
+        after: Optional[Tuple[object, ObjectId]] = None,
+        skip: int = 0,
+        fields: Optional[List[str]] = None
+    ) -> List[dict]:
+        """
+        Get one page of students in a stable (sort_field, _id) order, read
+        with MONGODB_HEAVY_READ_PREFERENCE.
+        
+        Args:
+            limit: Number of students to return
+            filters: Equality filters (e.g. risk_level)
+            sort_field: Field to sort by; _id breaks ties
+            descending: Sort direction
+            after: (sort value, _id) of the last student of the previous page
+            skip: Legacy offset (only used without after)
+            fields: Fields to fetch (default: whole documents); the sort
+                field is always fetched so the next cursor can be built
+        """
+        query = dict(filters) if filters else {}
+        if after is not None:
+            query = {"$and": [query, keyset_filter(sort_field, descending, *after)]}
+        
+        projection = None
+        if fields is not None:
+            projection = dict.fromkeys([*fields, sort_field], 1)
+        
+        cursor = db.read_db[StudentModel.collection_name].find(query, projection).sort(sort_spec(sort_field, descending))
+        if after is None and skip:
+            cursor = cursor.skip(skip)
+        students = await cursor.limit(limit).to_list(length=limit)
+        
+        for student in students:
+            student["_id"] = str(student["_id"])
+        
+        return students
+    
+    @staticmethod
+    async def update(student_id: str, update_data: dict, current: Optional[dict] = None) -> Optional[dict]:
+        """
+        Apply update_data to a student in one round trip.
+        
+        With current (the student as previously read), the write only
+        matches while the stored version still equals current's (optimistic
+        concurrency; documents without a version match None). Without it the
+        fields are set unconditionally and the previous document is returned
+        by the same command to keep the analytics summaries in step. Either
+        way the version is bumped. Returns the updated student, or None if the
+        student does not exist or changed since current was read.
+        """
         if not ObjectId.is_valid(student_id):
             return None
         
         update_data["updated_at"] = datetime.utcnow()
+        query = {"_id": ObjectId(student_id)}
+        if current is not None:
+            query["version"] = current.get("version")
         
-        result = await db.db[StudentModel.collection_name].update_one(
-            {"_id": ObjectId(student_id)},
-            {"$set": update_data}
+        found = await db.db[StudentModel.collection_name].find_one_and_update(
+            query,
+            {"$set": update_data, "$inc": {"version": 1}},
+            return_document=ReturnDocument.AFTER if current is not None else ReturnDocument.BEFORE
         )
+        if found is None:
+            return None
         
-        if result.modified_count > 0:
-            return await StudentModel.get_by_id(student_id)
-        return None
+        if current is None:
+            current = found
+            found = {**current, **update_data, "version": (current.get("version") or 0) + 1}
+        found["_id"] = str(found["_id"])
+        await StudentModel._update_summaries([(current, found)])
+        return found
     
     @staticmethod
     async def delete(student_id: str) -> bool:
@@ -74,8 +253,15 @@ class StudentModel:
         if not ObjectId.is_valid(student_id):
             return False
         
-        result = await db.db[StudentModel.collection_name].delete_one({"_id": ObjectId(student_id)})
-        return result.deleted_count > 0
+        deleted = await db.db[StudentModel.collection_name].find_one_and_delete(
+            {"_id": ObjectId(student_id)},
+            projection={field: 1 for field in StudentModel.summary_fields}
+        )
+        if deleted is None:
+            return False
+        
+        await StudentModel._update_summaries([(deleted, None)])
+        return True
     
     @staticmethod
     async def count(filters: dict = None) -> int:
@@ -0,0 +1,128 @@
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+from pymongo import UpdateOne
+from app.core.database import db
+
+RISK_LEVELS = ["Low", "Medium", "High"]
+
+SUMMARY_FEATURES = [
+    "attendance_percentage",
+    "assessment_score",
+    "assignment_score",
+    "internal_marks",
+    "previous_semester_gpa",
+]
+
+
+def _is_number(value) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+class StudentSummaryModel:
+    """
+    Materialized risk summaries, one document per (department, semester).
+
+    Each document holds counters and sums (student count, count per risk
+    level, scored count, risk_score sum, feature sums) that StudentModel
+    writes keep current with $inc, so means are computed from O(groups)
+    documents. rebuild() recomputes everything from the students collection.
+    """
+
+    collection_name = "student_summaries"
+
+    @staticmethod
+    def _group_key(student: dict) -> Tuple[str, int]:
+        return student.get("department"), student.get("semester")
+
+    @staticmethod
+    def _contribution(student: dict, sign: int, increments: Dict[str, float]):
+        """Add (sign=1) or remove (sign=-1) one student's counters to increments."""
+        increments["count"] += sign
+        if student.get("risk_level") in RISK_LEVELS:
+            increments[f"risk_levels.{student['risk_level']}"] += sign
+        if _is_number(student.get("risk_score")):
+            increments["scored_count"] += sign
+            increments["risk_score_sum"] += sign * student["risk_score"]
+        for feature in SUMMARY_FEATURES:
+            if _is_number(student.get(feature)):
+                increments[f"feature_sums.{feature}"] += sign * student[feature]
+
+    @staticmethod
+    async def apply_changes(changes: Iterable[Tuple[Optional[dict], Optional[dict]]]):
+        """
+        Fold student writes into the summaries with one bulk $inc.
+
+        Args:
+            changes: (before, after) pairs; before is None for inserts and
+                after is None for deletes
+        """
+        groups: Dict[Tuple[str, int], Dict[str, float]] = defaultdict(lambda: defaultdict(float))
+        for before, after in changes:
+            if before is not None:
+                StudentSummaryModel._contribution(before, -1, groups[StudentSummaryModel._group_key(before)])
+            if after is not None:
+                StudentSummaryModel._contribution(after, 1, groups[StudentSummaryModel._group_key(after)])
+
+        now = datetime.utcnow()
+        operations = []
+        for (department, semester), increments in groups.items():
+            increments = {field: value for field, value in increments.items() if value}
+            if not increments:
+                continue
+            operations.append(UpdateOne(
+                {"_id": {"department": department, "semester": semester}},
+                {
+                    "$inc": increments,
+                    "$set": {"updated_at": now},
+                    "$setOnInsert": {"department": department, "semester": semester}
+                },
+                upsert=True
+            ))
+
+        if operations:
+            await db.db[StudentSummaryModel.collection_name].bulk_write(operations, ordered=False)
+
+    @staticmethod
+    async def rebuild():
+        """Recompute all summaries from the students collection with one aggregation."""
+        group = {
+            "_id": {"department": "$department", "semester": "$semester"},
+            "count": {"$sum": 1},
+            # Same rule as _contribution: only numeric risk scores are counted and summed
+            "scored_count": {"$sum": {"$cond": [{"$isNumber": "$risk_score"}, 1, 0]}},
+            "risk_score_sum": {"$sum": "$risk_score"},
+        }
+        for level in RISK_LEVELS:
+            group[f"risk_{level}"] = {"$sum": {"$cond": [{"$eq": ["$risk_level", level]}, 1, 0]}}
+        for feature in SUMMARY_FEATURES:
+            group[f"sum_{feature}"] = {"$sum": f"${feature}"}
+
+        project = {
+            "department": "$_id.department",
+            "semester": "$_id.semester",
+            "count": 1,
+            "scored_count": 1,
+            "risk_score_sum": 1,
+            "risk_levels": {level: f"$risk_{level}" for level in RISK_LEVELS},
+            "feature_sums": {feature: f"$sum_{feature}" for feature in SUMMARY_FEATURES},
+            "updated_at": {"$literal": datetime.utcnow()},
+        }
+
+        # $out replaces the summary collection atomically once the pipeline completes
+        cursor = db.db["students"].aggregate([
+            {"$group": group},
+            {"$project": project},
+            {"$out": StudentSummaryModel.collection_name},
+        ])
+        await cursor.to_list(length=None)
+
+    @staticmethod
+    async def get_all(filters: dict = None) -> List[dict]:
+        """Get non-empty summaries, ordered by department and semester (heavy read preference)."""
+        query = {"count": {"$gt": 0}}
+        if filters:
+            query.update(filters)
+
+        cursor = db.read_db[StudentSummaryModel.collection_name].find(query).sort([("department", 1), ("semester", 1)])
+        return await cursor.to_list(length=None)
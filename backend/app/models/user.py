@@ -1,7 +1,9 @@
 from datetime import datetime
 from typing import Optional
 from bson import ObjectId
+from pymongo import ReturnDocument
 from app.core.database import db
+from app.services.user_cache import user_cache
 
 
 class UserModel:
@@ -11,7 +13,12 @@ class UserModel:
     
     @staticmethod
     async def create(user_data: dict) -> dict:
-        """Create a new user."""
+        """
+        Create a new user.
+        
+        Raises:
+            DuplicateKeyError: If the username or email is taken (unique indexes)
+        """
         user_data["created_at"] = datetime.utcnow().isoformat()
         user_data["is_active"] = True
         
@@ -45,3 +52,21 @@ class UserModel:
         if user:
             user["_id"] = str(user["_id"])
         return user
+    
+    @staticmethod
+    async def update(username: str, update_data: dict) -> Optional[dict]:
+        """Update a user and drop it from the authenticated-user cache."""
+        user = await db.db[UserModel.collection_name].find_one_and_update(
+            {"username": username},
+            {"$set": update_data},
+            return_document=ReturnDocument.AFTER
+        )
+        user_cache.invalidate(username)
+        if user:
+            user["_id"] = str(user["_id"])
+        return user
+    
+    @staticmethod
+    async def set_active(username: str, is_active: bool) -> Optional[dict]:
+        """Activate or deactivate a user; takes effect on the user's next request."""
+        return await UserModel.update(username, {"is_active": is_active})
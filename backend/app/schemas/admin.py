@@ -0,0 +1,72 @@
+from pydantic import BaseModel, Field
+from typing import Optional
+from datetime import datetime
+
+
+class ModelInfo(BaseModel):
+    """Currently active model."""
+    model_version: Optional[str] = None
+    model_path: Optional[str] = None
+    compiled: bool = False
+    mapped: bool = False
+    loaded_at: Optional[datetime] = None
+    
+    class Config:
+        protected_namespaces = ()
+
+
+class ModelReloadRequest(BaseModel):
+    """Request schema for reloading the model."""
+    model_path: Optional[str] = Field(
+        None,
+        description="Model file to load; must be in the MODEL_PATH directory (defaults to the active model path)"
+    )
+    
+    class Config:
+        protected_namespaces = ()
+
+
+class CanaryValidation(BaseModel):
+    """Result of scoring the canary batch with the new model."""
+    canary_rows: int
+    mean_abs_change: Optional[float] = Field(None, description="Mean absolute probability change vs. the previous model")
+
+
+class ModelReloadResponse(ModelInfo):
+    """Response schema for a completed model swap."""
+    previous_version: Optional[str] = None
+    validation: CanaryValidation
+
+
+class RescoreRequest(BaseModel):
+    """Request schema for starting a bulk re-score job."""
+    batch_size: Optional[int] = Field(None, ge=1, le=10000, description="Students per batch (default RESCORE_BATCH_SIZE)")
+    max_ops_per_second: Optional[float] = Field(None, ge=0, description="Write throttle, 0 = unlimited")
+    only_stale: bool = Field(True, description="Skip students already scored by the active model")
+
+
+class RescoreJobStatus(BaseModel):
+    """Progress of a bulk re-score job."""
+    id: str = Field(..., alias="_id")
+    status: str = Field(..., description="pending, running, completed, failed or interrupted")
+    batch_size: int
+    max_ops_per_second: float
+    only_stale: bool
+    last_id: Optional[str] = Field(None, description="Checkpoint: last processed student _id")
+    processed_count: int
+    updated_count: int
+    skipped_count: int
+    conflict_count: int = Field(0, description="Students changed during the job and left for a later one")
+    message: Optional[str] = None
+    created_at: datetime
+    updated_at: datetime
+    finished_at: Optional[datetime] = None
+    
+    class Config:
+        populate_by_name = True
+
+
+class UserAdminUpdate(BaseModel):
+    """Request schema for an admin changing a user account."""
+    full_name: Optional[str] = None
+    is_active: Optional[bool] = Field(None, description="Set to false to deactivate the account")
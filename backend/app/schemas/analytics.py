@@ -0,0 +1,24 @@
+from pydantic import BaseModel, Field
+from typing import Dict, List, Optional
+from datetime import datetime
+
+
+class RiskSummary(BaseModel):
+    """Risk distribution and feature means over a set of students."""
+    count: int = Field(..., description="Number of students")
+    risk_levels: Dict[str, int] = Field(..., description="Number of students per risk level")
+    average_risk_score: Optional[float] = Field(None, description="Mean risk score of scored students")
+    feature_means: Dict[str, Optional[float]]
+
+
+class GroupRiskSummary(RiskSummary):
+    """Risk summary of one department and semester."""
+    department: Optional[str] = None
+    semester: Optional[int] = None
+    updated_at: Optional[datetime] = None
+
+
+class RiskSummaryResponse(BaseModel):
+    """Response schema for the risk analytics summary."""
+    overall: RiskSummary
+    groups: List[GroupRiskSummary]
@@ -1,5 +1,5 @@
-from pydantic import BaseModel, Field, validator
-from typing import Optional, List, Dict
+from pydantic import BaseModel, Field, validator, model_validator
+from typing import Annotated, Optional, List, Dict
 from datetime import datetime
 
 
@@ -55,6 +55,10 @@ class PredictionResult(BaseModel):
     risk_score: int = Field(..., ge=0, le=100, description="Risk score (0-100)")
     risk_level: str = Field(..., description="Risk level: Low, Medium, or High")
     risk_factors: List[RiskFactor] = Field(..., description="Top 3 contributing risk factors")
+    model_version: Optional[str] = Field(None, description="Version of the model that produced the prediction")
+    
+    class Config:
+        protected_namespaces = ()
 
 
 class Student(StudentBase, StudentFeatures):
@@ -63,11 +67,13 @@ class Student(StudentBase, StudentFeatures):
     dropout_probability: Optional[float] = None
     risk_score: Optional[int] = None
     risk_level: Optional[str] = None
+    model_version: Optional[str] = None
     created_at: datetime
     updated_at: datetime
     
     class Config:
         populate_by_name = True
+        protected_namespaces = ()
         json_schema_extra = {
             "example": {
                 "_id": "507f1f77bcf86cd799439011",
@@ -85,12 +91,38 @@ class Student(StudentBase, StudentFeatures):
                 "dropout_probability": 0.25,
                 "risk_score": 25,
                 "risk_level": "Low",
+                "model_version": "9998acc7f54f",
                 "created_at": "2024-01-15T10:30:00",
                 "updated_at": "2024-01-15T10:30:00"
             }
         }
 
 
+class StudentSummary(BaseModel):
+    """Compact student schema for list views (`fields=summary`)."""
+    id: str = Field(..., alias="_id")
+    name: str
+    roll_number: str
+    department: str
+    dropout_probability: Optional[float] = None
+    risk_score: Optional[int] = None
+    risk_level: Optional[str] = None
+    
+    class Config:
+        populate_by_name = True
+        json_schema_extra = {
+            "example": {
+                "_id": "507f1f77bcf86cd799439011",
+                "name": "John Doe",
+                "roll_number": "2021CS001",
+                "department": "Computer Science",
+                "dropout_probability": 0.25,
+                "risk_score": 25,
+                "risk_level": "Low"
+            }
+        }
+
+
 class PredictionRequest(StudentFeatures):
     """Request schema for standalone prediction."""
     pass
@@ -129,3 +161,71 @@ class PredictionResponse(PredictionResult):
                 "timestamp": "2024-01-15T10:30:00"
             }
         }
+
+
+class StudentFeatureColumns(BaseModel):
+    """Column-oriented features for batch prediction (one list per feature)."""
+    attendance_percentage: List[Annotated[float, Field(ge=0, le=100)]]
+    assessment_score: List[Annotated[float, Field(ge=0, le=100)]]
+    assignment_score: List[Annotated[float, Field(ge=0, le=100)]]
+    internal_marks: List[Annotated[float, Field(ge=0, le=100)]]
+    previous_semester_gpa: List[Annotated[float, Field(ge=0, le=10)]]
+    
+    @model_validator(mode="after")
+    def check_equal_lengths(self):
+        lengths = {len(column) for column in self.model_dump().values()}
+        if len(lengths) > 1:
+            raise ValueError("All feature columns must have the same length")
+        return self
+    
+    def __len__(self) -> int:
+        return len(self.attendance_percentage)
+
+
+class BatchPredictionRequest(BaseModel):
+    """Request schema for batch prediction. Provide either students or columns."""
+    students: Optional[List[StudentFeatures]] = Field(None, description="Row-oriented student features")
+    columns: Optional[StudentFeatureColumns] = Field(None, description="Column-oriented student features")
+    
+    @model_validator(mode="after")
+    def check_single_source(self):
+        if (self.students is None) == (self.columns is None):
+            raise ValueError("Provide exactly one of 'students' or 'columns'")
+        return self
+    
+    def __len__(self) -> int:
+        if self.students is not None:
+            return len(self.students)
+        return len(self.columns)
+
+
+class BatchPredictionResponse(BaseModel):
+    """Response schema for batch prediction."""
+    count: int = Field(..., description="Number of scored students")
+    predictions: List[PredictionResult] = Field(..., description="Per-student results in request order")
+    timestamp: datetime = Field(default_factory=datetime.utcnow)
+
+
+class ImportRowError(BaseModel):
+    """Validation or write error for one uploaded row."""
+    row: int = Field(..., description="1-based data row number in the upload")
+    roll_number: Optional[str] = None
+    errors: List[str]
+
+
+class ImportJobStatus(BaseModel):
+    """Progress and error report of a bulk student import."""
+    id: str = Field(..., alias="_id")
+    status: str = Field(..., description="pending, running, completed or failed")
+    format: str
+    processed_rows: int
+    inserted_count: int
+    error_count: int
+    errors: List[ImportRowError] = Field(..., description="Row errors (capped at IMPORT_MAX_REPORTED_ERRORS)")
+    message: Optional[str] = None
+    created_at: datetime
+    updated_at: datetime
+    finished_at: Optional[datetime] = None
+    
+    class Config:
+        populate_by_name = True
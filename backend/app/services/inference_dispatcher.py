@@ -0,0 +1,226 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Dict, List, Optional, Tuple
+from app.core.config import settings
+from app.services.ml_service import MLModelService, ml_service
+
+
+class InferenceDispatcher:
+    """
+    Runs model inference off the event loop with adaptive micro-batching.
+
+    Concurrent handlers enqueue single predictions and await a future. A
+    background task collects queued requests into a batch (up to
+    ``max_batch_size`` rows, waiting at most ``batch_window_ms`` for more),
+    scores the batch with one model call on a worker thread and resolves each
+    caller's future. While all workers are busy new requests keep queueing, so
+    batches grow with load instead of requests waiting one by one.
+    """
+
+    def __init__(
+        self,
+        service: MLModelService,
+        max_batch_size: int = 64,
+        batch_window_ms: float = 2.0,
+        max_workers: int = 1
+    ):
+        self.service = service
+        self.max_batch_size = max_batch_size
+        self.batch_window = batch_window_ms / 1000
+        self.max_workers = max_workers
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker_slots: Optional[asyncio.Semaphore] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._collector: Optional[asyncio.Task] = None
+        self._batches: set = set()
+        self._stopping = False
+
+    @property
+    def running(self) -> bool:
+        return self._collector is not None and not self._collector.done()
+
+    async def start(self):
+        """Start the batch collector on the running event loop."""
+        if self.running:
+            return
+        self._queue = asyncio.Queue()
+        self._worker_slots = asyncio.Semaphore(self.max_workers)
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_workers,
+            thread_name_prefix="inference"
+        )
+        self._collector = asyncio.create_task(self._collect())
+        print(f"Inference dispatcher started ({self.max_workers} worker(s), "
+              f"batch <= {self.max_batch_size}, window {self.batch_window * 1000:g} ms)")
+
+    async def stop(self):
+        """Finish queued and in-flight batches, then shut down the workers."""
+        if not self.running:
+            return
+        self._stopping = True
+        try:
+            await self._queue.put(None)
+            await self._collector
+            if self._batches:
+                await asyncio.gather(*self._batches, return_exceptions=True)
+            self._executor.shutdown(wait=True)
+            self._collector = None
+        finally:
+            self._stopping = False
+        print("Inference dispatcher stopped")
+
+    async def predict(self, features: Dict[str, float], explain: bool = False) -> Dict[str, any]:
+        """
+        Score one student through the shared batch queue.
+
+        Args:
+            features: Dictionary containing student features
+            explain: Whether to include risk_factors in the result
+
+        Returns:
+            Dictionary with dropout_probability, risk_score, risk_level,
+            model_version and, if requested, risk_factors
+
+        Raises:
+            RuntimeError: If the dispatcher is stopping
+        """
+        if self._stopping:
+            raise RuntimeError("Inference dispatcher is stopping")
+        if not self.running:
+            await self.start()
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((features, explain, future))
+        return await future
+
+    async def predict_many(
+        self,
+        features: List[Dict[str, float]],
+        include_factors: bool = True
+    ) -> List[Dict[str, any]]:
+        """
+        Score an already-formed batch on a worker thread, bypassing the queue.
+        """
+        if not self.running:
+            await self.start()
+        async with self._worker_slots:
+            return await asyncio.get_running_loop().run_in_executor(
+                self._executor, self.service.predict_batch, features, include_factors
+            )
+
+    async def _collect(self):
+        """
+        Group queued requests into batches and hand them to the workers. On
+        exit, requests still queued (or caught mid-batch by a cancellation)
+        are failed instead of being left waiting.
+        """
+        loop = asyncio.get_running_loop()
+        stopping = False
+        batch = []
+        try:
+            while not stopping:
+                item = await self._queue.get()
+                if item is None:
+                    break
+
+                # Wait for a free worker first; requests arriving meanwhile join this batch
+                batch = [item]
+                await self._worker_slots.acquire()
+                try:
+                    deadline = loop.time() + self.batch_window
+                    while len(batch) < self.max_batch_size:
+                        if not self._queue.empty():
+                            item = self._queue.get_nowait()
+                        else:
+                            timeout = deadline - loop.time()
+                            if timeout <= 0:
+                                break
+                            try:
+                                item = await asyncio.wait_for(self._queue.get(), timeout)
+                            except asyncio.TimeoutError:
+                                break
+                        if item is None:
+                            stopping = True
+                            break
+                        batch.append(item)
+
+                    task = asyncio.create_task(self._run_batch(batch))
+                except BaseException:
+                    self._worker_slots.release()
+                    raise
+                self._batches.add(task)
+                # Release the slot from a callback so it is freed even if the
+                # task is cancelled before it starts running
+                task.add_done_callback(partial(self._finish_batch, batch=batch))
+                batch = []
+        finally:
+            while not self._queue.empty():
+                item = self._queue.get_nowait()
+                if item is not None:
+                    batch.append(item)
+            self._fail(batch, RuntimeError("Inference dispatcher stopped"))
+
+    def _finish_batch(self, task: asyncio.Task, batch: List[Tuple[Dict[str, float], bool, asyncio.Future]]):
+        """Done callback of a batch task: free its worker slot, fail unresolved callers."""
+        self._batches.discard(task)
+        self._worker_slots.release()
+        self._fail(batch, RuntimeError("Inference batch was cancelled"))
+
+    @staticmethod
+    def _fail(batch: List[Tuple[Dict[str, float], bool, asyncio.Future]], error: Exception):
+        for _, _, future in batch:
+            if not future.done():
+                future.set_exception(error)
+
+    async def _run_batch(self, batch: List[Tuple[Dict[str, float], bool, asyncio.Future]]):
+        """
+        Score a batch on the executor and resolve each caller's future. If the
+        batch call fails, its rows are scored one by one so an error reaches
+        only the request that caused it. The worker slot is released by
+        _finish_batch.
+        """
+        loop = asyncio.get_running_loop()
+        rows = [features for features, _, _ in batch]
+        explain = [explain for _, explain, _ in batch]
+        try:
+            outcomes = [(result, None) for result in await loop.run_in_executor(
+                self._executor, self._score, rows, explain
+            )]
+        except Exception as e:
+            if len(batch) == 1:
+                outcomes = [(None, e)]
+            else:
+                outcomes = await loop.run_in_executor(self._executor, self._score_each, rows, explain)
+        
+        for (_, _, future), (result, error) in zip(batch, outcomes):
+            if future.done():
+                continue
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+
+    def _score(self, rows: List[Dict[str, float]], explain: List[bool]) -> List[Dict[str, any]]:
+        """Worker-thread body: one model call for the batch, factors only where requested."""
+        return self.service.predict_batch(rows, include_factors=explain)
+
+    def _score_each(
+        self, rows: List[Dict[str, float]], explain: List[bool]
+    ) -> List[Tuple[Optional[Dict[str, any]], Optional[Exception]]]:
+        """Worker-thread body after a failed batch: (result, error) per row."""
+        outcomes = []
+        for row, row_explain in zip(rows, explain):
+            try:
+                outcomes.append((self.service.predict_batch([row], include_factors=[row_explain])[0], None))
+            except Exception as e:
+                outcomes.append((None, e))
+        return outcomes
+
+
+# Global instance
+inference_dispatcher = InferenceDispatcher(
+    ml_service,
+    max_batch_size=settings.INFERENCE_MAX_BATCH_SIZE,
+    batch_window_ms=settings.INFERENCE_BATCH_WINDOW_MS,
+    max_workers=settings.INFERENCE_WORKERS
+)
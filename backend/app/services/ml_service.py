@@ -1,16 +1,77 @@
-import joblib
-import pandas as pd
+import hashlib
+import threading
+import time
 import numpy as np
-from typing import Dict, List, Tuple
+from datetime import datetime
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple, Union
 from pathlib import Path
 from app.core.config import settings
+from app.core.metrics import observe_inference
+from app.services.prediction_cache import PredictionCache
+from app.services.tree_engine import CompiledTreeEnsemble, MappedTreeModel, compile_model
+
+
+class LoadedModel(NamedTuple):
+    """Immutable snapshot of a loaded model. Reloads swap the whole snapshot at once."""
+    model: Any
+    compiled: Optional[CompiledTreeEnsemble]
+    version: str
+    path: str
+    loaded_at: datetime
 
 
 class MLModelService:
-    """Service for loading and using the XGBoost model for predictions."""
+    """
+    Service for loading and using the XGBoost model for predictions.
+    
+    The model is loaded by the application lifespan (``load_model``), not at
+    import, so importing this module does not pull in xgboost or joblib.
+    
+    With MODEL_MMAP_PATH set, the compiled tree arrays of a model that passed
+    validation are exported to that file once and every load of the same
+    model version, including the exporting one, maps it read-only instead of
+    keeping the unpickled model, so worker processes share one copy of the
+    model, never import xgboost and all explain predictions the same way.
+    """
+    
+    # Model files in XGBoost's native formats; anything else is unpickled with joblib
+    NATIVE_FORMATS = (".json", ".ubj")
+    
+    # How risk_factors are chosen: "contributions" ranks features by the model's
+    # per-student SHAP values (pred_contribs); "importance" weights the global
+    # feature_importances_ by a per-feature risk heuristic
+    EXPLANATION_MODES = ("contributions", "importance")
+    
+    # Number of risk factors reported per student
+    TOP_FACTORS = 3
+    
+    # Feature value at which the importance heuristic sees no risk (in feature_names order)
+    IDEAL_VALUES = np.array([100.0, 100.0, 100.0, 100.0, 10.0])
+    
+    # Maximum allowed deviation of the compiled engine from predict_proba
+    COMPILED_TOLERANCE = 1e-5
+    
+    # Largest batch scored with the compiled engine when the original model is
+    # loaded; XGBoost's predict_proba is faster from about 16 rows up
+    COMPILED_MAX_ROWS = 8
+    
+    # Fixed rows every candidate model must score sensibly before it is swapped in
+    CANARY_FEATURES = [
+        [65.0, 55.0, 60.0, 58.0, 6.2],
+        [92.0, 88.0, 90.0, 85.0, 8.7],
+        [45.0, 35.0, 40.0, 38.0, 4.5],
+        [0.0, 0.0, 0.0, 0.0, 0.0],
+        [100.0, 100.0, 100.0, 100.0, 10.0]
+    ]
     
     def __init__(self):
-        self.model = None
+        self._active: Optional[LoadedModel] = None
+        self._reload_lock = threading.Lock()
+        self.cache = PredictionCache(
+            max_size=settings.PREDICTION_CACHE_SIZE,
+            ttl_seconds=settings.PREDICTION_CACHE_TTL_SECONDS,
+            decimals=settings.PREDICTION_CACHE_DECIMALS
+        )
         self.feature_names = [
             "attendance_percentage",
             "assessment_score",
@@ -18,109 +79,554 @@ class MLModelService:
             "internal_marks",
             "previous_semester_gpa"
         ]
-        self.load_model()
+        self._explanation_templates = self._build_explanation_templates()
+        self.explanation_mode = settings.EXPLANATION_MODE
+        if self.explanation_mode not in self.EXPLANATION_MODES:
+            print(f"Warning: unknown EXPLANATION_MODE {self.explanation_mode!r}; using 'importance'")
+            self.explanation_mode = "importance"
+    
+    @property
+    def model(self):
+        return self._active.model if self._active else None
+    
+    @property
+    def compiled_model(self) -> Optional[CompiledTreeEnsemble]:
+        return self._active.compiled if self._active else None
+    
+    @property
+    def model_version(self) -> Optional[str]:
+        return self._active.version if self._active else None
+    
+    @property
+    def model_path(self) -> Optional[str]:
+        return self._active.path if self._active else None
+    
+    def model_info(self) -> Dict[str, Any]:
+        """Version and source of the active model."""
+        active = self._active
+        if active is None:
+            return {"model_version": None, "model_path": None, "compiled": False, "mapped": False, "loaded_at": None}
+        return {
+            "model_version": active.version,
+            "model_path": active.path,
+            "compiled": active.compiled is not None,
+            "mapped": isinstance(active.model, MappedTreeModel),
+            "loaded_at": active.loaded_at
+        }
+    
+    @property
+    def ready(self) -> bool:
+        return self._active is not None
     
     def load_model(self):
         """Load the pre-trained XGBoost model."""
         try:
             model_path = Path(settings.MODEL_PATH)
             if model_path.exists():
-                self.model = joblib.load(model_path)
-                print(f"Model loaded successfully from {model_path}")
+                candidate = self._load(model_path)
+                self.validate_model(candidate)
+                self._active = self._share(candidate)
             else:
                 print(f"Warning: Model file not found at {model_path}")
                 print("Predictions will not be available until model is provided.")
         except Exception as e:
             print(f"Error loading model: {e}")
-            self.model = None
+            self._active = None
     
-    def predict_dropout_probability(self, features: Dict[str, float]) -> Tuple[float, int, str]:
+    def reload_model(self, model_path: Optional[str] = None) -> Dict[str, Any]:
         """
-        Predict dropout probability for a student.
+        Load a model, validate it on the canary batch and atomically swap it in.
+        
+        Requests already running keep using the snapshot they started with;
+        the current model stays active if loading or validation fails.
         
         Args:
-            features: Dictionary containing student features
+            model_path: Model file to load (defaults to the active or configured path)
             
         Returns:
-            Tuple of (dropout_probability, risk_score, risk_level)
+            Dictionary describing the previous and new model versions
         """
-        if self.model is None:
-            raise ValueError("Model not loaded. Please ensure the model file exists.")
+        with self._reload_lock:
+            previous = self._active
+            path = Path(model_path or (previous.path if previous else settings.MODEL_PATH))
+            if not path.exists():
+                raise ValueError(f"Model file not found at {path}")
+            
+            candidate = self._load(path)
+            validation = self.validate_model(candidate)
+            candidate = self._share(candidate)
+            self._active = candidate
+            info = self.model_info()
         
-        # Prepare input data
-        input_data = pd.DataFrame([features])[self.feature_names]
+        print(f"Model swapped: {previous.version if previous else None} -> {candidate.version}")
+        return {
+            **info,
+            "previous_version": previous.version if previous else None,
+            "validation": validation
+        }
+    
+    def validate_model(self, candidate: LoadedModel) -> Dict[str, Any]:
+        """
+        Score the canary batch with a candidate model.
         
-        # Get prediction probabilities
-        # predict_proba returns [probability_not_dropout, probability_dropout]
-        proba = self.model.predict_proba(input_data)[0]
-        dropout_probability = float(proba[1])  # Probability of dropout
+        Raises:
+            ValueError: If the probabilities are malformed
+            
+        Returns:
+            Canary statistics, including the mean change from the active model
+        """
+        canary = np.array(self.CANARY_FEATURES, dtype=np.float64)
+        raw = np.asarray(candidate.model.predict_proba(canary), dtype=np.float64)
+        if raw.shape != (canary.shape[0], 2):
+            raise ValueError(f"Model returned probabilities with shape {raw.shape}, expected ({canary.shape[0]}, 2)")
         
-        # Calculate risk score (0-100)
-        risk_score = int(dropout_probability * 100)
+        probabilities = self._predict_proba(candidate, canary)
+        if not np.all(np.isfinite(probabilities)) or np.any((probabilities < 0) | (probabilities > 1)):
+            raise ValueError("Model returned invalid probabilities on the canary batch")
         
-        # Determine risk level
-        if risk_score <= 40:
-            risk_level = "Low"
-        elif risk_score <= 70:
-            risk_level = "Medium"
-        else:
-            risk_level = "High"
+        result = {"canary_rows": int(canary.shape[0]), "mean_abs_change": None}
+        active = self._active
+        if active is not None:
+            result["mean_abs_change"] = float(
+                np.mean(np.abs(probabilities - self._predict_proba(active, canary)))
+            )
+        return result
+    
+    def warm_up(self) -> float:
+        """
+        Run the canary batch through the active model once (without touching
+        the prediction cache) so the first request does not pay for lazy
+        initialisation. Returns the time taken in milliseconds.
+        """
+        active = self._active
+        if active is None:
+            return 0.0
+        started = time.perf_counter()
+        canary = np.array(self.CANARY_FEATURES, dtype=np.float64)
+        self._predict_proba(active, canary)
+        self._predict_proba(active, canary[:1])
+        if active.compiled is not None:
+            active.model.predict_proba(canary[:1])
+        if self.explanation_mode == "contributions" and hasattr(active.model, "get_booster"):
+            self._contributions(active, canary[:1])
+        return (time.perf_counter() - started) * 1000
+    
+    def _deserialize(self, model_path: Path):
+        """Load a model from XGBoost JSON/UBJ or a joblib pickle (heavy imports happen here)."""
+        if model_path.suffix.lower() in self.NATIVE_FORMATS:
+            from xgboost import XGBClassifier
+            
+            model = XGBClassifier()
+            model.load_model(str(model_path))
+            return model
+        
+        import joblib
+        return joblib.load(model_path)
+    
+    def _load(self, model_path: Path) -> LoadedModel:
+        """
+        Fingerprint a model file, then map its exported tree arrays if they
+        are current, or deserialize and (optionally) compile it. Nothing is
+        exported here; see _share.
+        """
+        started = time.perf_counter()
+        payload = model_path.read_bytes()
+        version = hashlib.sha256(payload).hexdigest()[:12]
+        
+        if settings.MODEL_MMAP_PATH:
+            mapped = self._load_mapped(Path(settings.MODEL_MMAP_PATH), version)
+            if mapped is not None:
+                print(f"Model {version} mapped from {settings.MODEL_MMAP_PATH} "
+                      f"in {(time.perf_counter() - started) * 1000:.0f} ms")
+                return LoadedModel(
+                    model=mapped,
+                    compiled=mapped.compiled,
+                    version=version,
+                    path=str(model_path),
+                    loaded_at=datetime.utcnow()
+                )
+        
+        model = self._deserialize(model_path)
+        print(f"Model loaded successfully from {model_path} (version {version}) "
+              f"in {(time.perf_counter() - started) * 1000:.0f} ms")
+        
+        compiled = None
+        if settings.COMPILE_MODEL or settings.MODEL_MMAP_PATH:
+            compiled = self._compile_model(model)
+        return LoadedModel(
+            model=model,
+            compiled=compiled,
+            version=version,
+            path=str(model_path),
+            loaded_at=datetime.utcnow()
+        )
+    
+    def _load_mapped(self, path: Path, version: str) -> Optional[MappedTreeModel]:
+        """Map exported tree arrays if they belong to this model version, else None."""
+        if not path.exists():
+            return None
+        try:
+            compiled, metadata = CompiledTreeEnsemble.load_mapped(path)
+        except Exception as e:
+            print(f"Warning: could not map {path}, loading the model file: {e}")
+            return None
         
-        return dropout_probability, risk_score, risk_level
+        if metadata.get("model_version") != version or metadata.get("feature_names") != self.feature_names:
+            print(f"{path} was exported from another model version; re-exporting")
+            return None
+        if self.explanation_mode == "contributions":
+            print("Note: a mapped model has no booster for SHAP contributions; risk factors use importances")
+        return MappedTreeModel(compiled, metadata.get("feature_importances"))
     
-    def get_feature_importance(self, features: Dict[str, float]) -> List[Dict[str, any]]:
+    def _share(self, candidate: LoadedModel) -> LoadedModel:
+        """
+        With MODEL_MMAP_PATH set, export a validated, freshly deserialized
+        model and switch to the mapped copy, so this worker serves exactly what
+        the workers mapping the file serve. Otherwise returns candidate.
         """
-        Get top contributing features using feature importance from the model.
+        if not settings.MODEL_MMAP_PATH or candidate.compiled is None or isinstance(candidate.model, MappedTreeModel):
+            return candidate
+        
+        path = Path(settings.MODEL_MMAP_PATH)
+        if not self._export_mapped(path, candidate.compiled, candidate.model, candidate.version):
+            return candidate
+        mapped = self._load_mapped(path, candidate.version)
+        if mapped is None:
+            return candidate
+        return candidate._replace(model=mapped, compiled=mapped.compiled)
+    
+    def _export_mapped(self, path: Path, compiled: CompiledTreeEnsemble, model, version: str) -> bool:
+        """Write compiled tree arrays for other processes to map. Failures are logged, not raised."""
+        try:
+            importances = getattr(model, "feature_importances_", None)
+            compiled.save(path, {
+                "model_version": version,
+                "feature_names": self.feature_names,
+                "feature_importances": None if importances is None else np.asarray(importances, dtype=np.float64).tolist()
+            })
+            print(f"Model {version} exported to {path} for memory-mapped loading")
+            return True
+        except Exception as e:
+            print(f"Warning: could not export the model to {path}: {e}")
+            return False
+    
+    def _snapshot(self) -> LoadedModel:
+        """The active model, read once so a request never mixes two models."""
+        active = self._active
+        if active is None:
+            raise ValueError("Model not loaded. Please ensure the model file exists.")
+        return active
+    
+    def _cache_key(self, namespace: str, model_version: str, values) -> tuple:
+        """Cache key for a feature vector under a model version."""
+        return self.cache.make_key(namespace, model_version, values)
+    
+    def _compile_model(self, model) -> Optional[CompiledTreeEnsemble]:
+        """
+        Compile the model into flat NumPy tree arrays and verify it against
+        predict_proba on a probe batch. Returns None if either step fails.
+        """
+        try:
+            compiled = compile_model(model, self.feature_names)
+            if compiled is None:
+                return None
+            
+            rng = np.random.default_rng(0)
+            probe = np.column_stack([
+                rng.uniform(0, 100, size=(256, 4)),
+                rng.uniform(0, 10, size=256)
+            ])
+            error = compiled.max_abs_error(model, probe)
+            if error > self.COMPILED_TOLERANCE:
+                print(f"Warning: compiled model deviates from predict_proba by {error:.2e}; using predict_proba")
+                return None
+            
+            print(f"Model compiled to {compiled.n_trees} trees / {compiled.n_nodes} nodes (max error {error:.1e})")
+            return compiled
+        except Exception as e:
+            print(f"Warning: could not compile model, using predict_proba: {e}")
+            return None
+    
+    @staticmethod
+    def _predict_proba(active: LoadedModel, matrix: np.ndarray) -> np.ndarray:
+        """
+        Dropout probabilities (float64) for an (N, 5) feature matrix. Small
+        batches use the compiled engine, larger ones the original model
+        (a mapped model only has the compiled engine).
+        """
+        started = time.perf_counter()
+        if active.compiled is not None and (
+            matrix.shape[0] <= MLModelService.COMPILED_MAX_ROWS or isinstance(active.model, MappedTreeModel)
+        ):
+            probabilities = active.compiled.predict_proba(matrix)[:, 1]
+        else:
+            probabilities = active.model.predict_proba(matrix)[:, 1].astype(np.float64)
+        observe_inference("predict", matrix.shape[0], started)
+        return probabilities
+    
+    def predict_batch(
+        self,
+        features: Union[List[Dict[str, float]], Dict[str, List[float]], np.ndarray],
+        include_factors: Union[bool, Sequence[bool]] = True
+    ) -> List[Dict[str, any]]:
+        """
+        Predict dropout risk for many students with a single model call.
         
         Args:
-            features: Dictionary containing student features
+            features: List of feature dictionaries, a dictionary of per-feature
+                columns, or an (N, 5) array in ``feature_names`` order
+            include_factors: Whether to compute risk_factors, for all rows or
+                as one flag per row
             
         Returns:
-            List of top 3 risk factors with their importance
+            List of dictionaries (one per row, in input order) with
+            dropout_probability, risk_score, risk_level, model_version and,
+            if requested, risk_factors
         """
-        if self.model is None:
-            raise ValueError("Model not loaded. Please ensure the model file exists.")
+        active = self._snapshot()
         
-        # Get feature importances from the model
-        if hasattr(self.model, 'feature_importances_'):
-            importances = self.model.feature_importances_
-        else:
-            # Fallback for models without feature_importances_
-            importances = np.ones(len(self.feature_names)) / len(self.feature_names)
+        matrix = self.to_feature_matrix(features)
+        n_rows = matrix.shape[0]
+        if n_rows == 0:
+            return []
+        
+        rows = matrix.tolist()
+        predictions = [None] * n_rows
+        cache_keys = None
+        if self.cache.enabled:
+            cache_keys = [self._cache_key("prediction", active.version, row) for row in rows]
+            predictions = [self.cache.get(key) for key in cache_keys]
+        missing = [i for i, prediction in enumerate(predictions) if prediction is None]
+        
+        if missing:
+            # One model call over all uncached rows
+            probabilities = self._predict_proba(active, matrix if len(missing) == n_rows else matrix[missing])
+            risk_scores = (probabilities * 100).astype(np.int64)
+            risk_levels = np.where(
+                risk_scores <= 40, "Low", np.where(risk_scores <= 70, "Medium", "High")
+            )
+            for j, i in enumerate(missing):
+                predictions[i] = (float(probabilities[j]), int(risk_scores[j]), str(risk_levels[j]))
+                if cache_keys is not None:
+                    self.cache.set(cache_keys[i], predictions[i])
+        
+        if isinstance(include_factors, bool):
+            include_factors = [include_factors] * n_rows
+        
+        # Explanations for all requested rows at once
+        wanted = [i for i, wants_factors in enumerate(include_factors) if wants_factors]
+        factors = dict(zip(wanted, self._explain_rows(active, matrix[wanted]))) if wanted else {}
         
-        # Calculate weighted importance based on actual values
-        weighted_importance = []
-        for i, feature_name in enumerate(self.feature_names):
-            feature_value = features.get(feature_name, 0)
+        results = []
+        for i, (dropout_probability, risk_score, risk_level) in enumerate(predictions):
+            result = {
+                "dropout_probability": dropout_probability,
+                "risk_score": risk_score,
+                "risk_level": risk_level,
+                "model_version": active.version
+            }
+            if i in factors:
+                result["risk_factors"] = factors[i]
+            results.append(result)
+        
+        return results
+    
+    def to_feature_matrix(
+        self,
+        features: Union[List[Dict[str, float]], Dict[str, List[float]], np.ndarray]
+    ) -> np.ndarray:
+        """
+        Convert row- or column-oriented features into an (N, 5) float matrix.
+        
+        Args:
+            features: List of feature dictionaries, a dictionary of per-feature
+                columns, or an array already in ``feature_names`` order
             
-            # Normalize feature value (lower values indicate higher risk)
-            if feature_name == "attendance_percentage":
-                normalized_risk = (100 - feature_value) / 100
-            elif feature_name == "assessment_score":
-                normalized_risk = (100 - feature_value) / 100
-            elif feature_name == "assignment_score":
-                normalized_risk = (100 - feature_value) / 100
-            elif feature_name == "internal_marks":
-                normalized_risk = (100 - feature_value) / 100
-            elif feature_name == "previous_semester_gpa":
-                normalized_risk = (10 - feature_value) / 10
+        Returns:
+            Float64 matrix with one row per student
+        """
+        if isinstance(features, np.ndarray):
+            matrix = np.asarray(features, dtype=np.float64)
+        elif isinstance(features, dict):
+            matrix = np.column_stack(
+                [np.asarray(features[name], dtype=np.float64) for name in self.feature_names]
+            )
+        else:
+            matrix = np.array(
+                [[row[name] for name in self.feature_names] for row in features],
+                dtype=np.float64
+            ).reshape(-1, len(self.feature_names))
+        
+        if matrix.ndim != 2 or matrix.shape[1] != len(self.feature_names):
+            raise ValueError(
+                f"Expected features with shape (N, {len(self.feature_names)}), got {matrix.shape}"
+            )
+        return matrix
+    
+    def _importances(self, active: LoadedModel) -> np.ndarray:
+        """Global feature importances of a model snapshot as float64."""
+        if hasattr(active.model, 'feature_importances_'):
+            return np.asarray(active.model.feature_importances_, dtype=np.float64)
+        # Fallback for models without feature_importances_
+        return np.ones(len(self.feature_names)) / len(self.feature_names)
+    
+    @staticmethod
+    def _top_k(scores: np.ndarray, k: int) -> np.ndarray:
+        """
+        Column indices of the k highest scores per row, highest first, with
+        ties kept in column order (the same order as a stable sort).
+        """
+        n_columns = scores.shape[1]
+        if k >= n_columns:
+            return np.argsort(-scores, axis=1, kind="stable")
+        
+        partitioned = np.argpartition(-scores, k, axis=1)
+        top = np.sort(partitioned[:, :k], axis=1)
+        top = np.take_along_axis(top, np.argsort(-np.take_along_axis(scores, top, 1), axis=1, kind="stable"), 1)
+        
+        # argpartition may keep either column of a tie across the cut; a stable sort keeps the first
+        lowest_kept = np.take_along_axis(scores, top[:, -1:], 1)[:, 0]
+        first_dropped = np.take_along_axis(scores, partitioned[:, k:k + 1], 1)[:, 0]
+        tied = lowest_kept == first_dropped
+        if tied.any():
+            top[tied] = np.argsort(-scores[tied], axis=1, kind="stable")[:, :k]
+        return top
+    
+    def _importance_factors(self, active: LoadedModel, matrix: np.ndarray) -> List[List[Dict[str, any]]]:
+        """
+        Top 3 features by global importance weighted by each feature's
+        distance from IDEAL_VALUES, for every row of an (N, 5) matrix.
+        """
+        importances = self._importances(active)
+        weighted = importances * ((self.IDEAL_VALUES - matrix) / self.IDEAL_VALUES)
+        top = self._top_k(weighted, self.TOP_FACTORS)
+        explanations = self._explanations(matrix, top)
+        
+        rows = matrix.tolist()
+        labels = [self._format_feature_name(name) for name in self.feature_names]
+        importances = importances.tolist()
+        return [
+            [
+                {
+                    "feature": labels[k],
+                    "value": rows[i][k],
+                    "importance": importances[k],
+                    "explanation": explanations[i][j]
+                }
+                for j, k in enumerate(row_top)
+            ]
+            for i, row_top in enumerate(top.tolist())
+        ]
+    
+    def _build_explanation_templates(self) -> List[Tuple[float, str, str]]:
+        """
+        (threshold, text below threshold, text otherwise) per feature, in
+        feature_names order.
+        """
+        templates = []
+        for name in self.feature_names:
+            label = self._format_feature_name(name)
+            if "Attendance" in label:
+                templates.append((75, "Low attendance ({}%) - Below required 75%", "Attendance at {}% - Could be improved"))
+            elif "Assessment" in label or "Assignment" in label or "Internal" in label:
+                templates.append((60, f"{label} is low ({{}}) - Below passing threshold", f"{label} at {{}} - Room for improvement"))
+            elif "GPA" in label:
+                templates.append((6.0, "Low previous GPA ({}) - Academic support needed", "Previous GPA at {} - Maintain consistency"))
             else:
-                normalized_risk = 0.5
-            
-            # Weight by model's feature importance
-            weighted_score = importances[i] * normalized_risk
-            
-            weighted_importance.append({
-                "feature": self._format_feature_name(feature_name),
-                "value": feature_value,
-                "importance": float(importances[i]),
-                "weighted_score": float(weighted_score)
-            })
+                templates.append((0, "", ""))
+        return templates
+    
+    def _explanations(self, matrix: np.ndarray, top: np.ndarray) -> List[List[str]]:
+        """Explanation text for the selected (row, feature) pairs from the precomputed templates."""
+        thresholds = np.array([threshold for threshold, _, _ in self._explanation_templates])
+        low = (matrix < thresholds).tolist()
+        rows = matrix.tolist()
+        templates = self._explanation_templates
+        return [
+            [
+                (templates[k][1] if low[i][k] else templates[k][2]).format(rows[i][k])
+                for k in row_top
+            ]
+            for i, row_top in enumerate(top.tolist())
+        ]
+    
+    def _explain_rows(self, active: LoadedModel, matrix: np.ndarray) -> List[List[Dict[str, any]]]:
+        """
+        risk_factors for every row of a feature matrix, in the configured
+        explanation mode. Cached per row; all uncached rows are explained with
+        one call.
+        """
+        if self.explanation_mode == "contributions" and hasattr(active.model, "get_booster"):
+            namespace, explain = "contributions", self._contribution_factors
+        else:
+            namespace, explain = "importance", self._importance_factors
+        
+        rows = matrix.tolist()
+        factors = [None] * len(rows)
+        cache_keys = None
+        if self.cache.enabled:
+            cache_keys = [self._cache_key(namespace, active.version, row) for row in rows]
+            factors = [self.cache.get(key) for key in cache_keys]
+        missing = [i for i, row_factors in enumerate(factors) if row_factors is None]
         
-        # Sort by weighted score and return top 3
-        weighted_importance.sort(key=lambda x: x['weighted_score'], reverse=True)
+        if missing:
+            explained = explain(active, matrix if len(missing) == len(rows) else matrix[missing])
+            for i, row_factors in zip(missing, explained):
+                factors[i] = row_factors
+                if cache_keys is not None:
+                    self.cache.set(cache_keys[i], row_factors)
         
-        return weighted_importance[:3]
+        return [[dict(factor) for factor in row_factors] for row_factors in factors]
+    
+    def _contributions(self, active: LoadedModel, matrix: np.ndarray) -> np.ndarray:
+        """
+        Per-student SHAP contributions of each feature to the dropout log-odds
+        (one booster call per batch); each row plus the model's bias sums to
+        the row's margin.
+        """
+        from xgboost import DMatrix
+        
+        booster = active.model.get_booster()
+        # The booster may have been trained with its columns in another order
+        names = booster.feature_names or self.feature_names
+        order = [self.feature_names.index(name) for name in names]
+        
+        try:
+            iteration_range = (0, active.model.best_iteration + 1)
+        except AttributeError:
+            iteration_range = (0, 0)
+        
+        started = time.perf_counter()
+        raw = booster.predict(
+            DMatrix(matrix[:, order], feature_names=booster.feature_names),
+            pred_contribs=True,
+            iteration_range=iteration_range
+        )
+        observe_inference("contributions", matrix.shape[0], started)
+        contributions = np.empty((matrix.shape[0], len(self.feature_names)), dtype=np.float64)
+        contributions[:, order] = raw[:, :-1]
+        return contributions
+    
+    def _contribution_factors(self, active: LoadedModel, matrix: np.ndarray) -> List[List[Dict[str, any]]]:
+        """Top 3 features pushing each student towards dropout, by SHAP value (one booster call)."""
+        contributions = self._contributions(active, matrix)
+        top = self._top_k(contributions, self.TOP_FACTORS)
+        explanations = self._explanations(matrix, top)
+        
+        rows = matrix.tolist()
+        labels = [self._format_feature_name(name) for name in self.feature_names]
+        return [
+            [
+                {
+                    "feature": labels[k],
+                    "value": rows[i][k],
+                    "importance": float(contributions[i, k]),
+                    "explanation": explanations[i][j]
+                }
+                for j, k in enumerate(row_top)
+            ]
+            for i, row_top in enumerate(top.tolist())
+        ]
     
     def _format_feature_name(self, feature_name: str) -> str:
         """Format feature name for display."""
@@ -132,41 +638,17 @@ class MLModelService:
             "previous_semester_gpa": "Previous Semester GPA"
         }
         return name_map.get(feature_name, feature_name)
-    
-    def get_risk_explanation(self, risk_factors: List[Dict[str, any]]) -> List[str]:
-        """
-        Generate human-readable explanations for risk factors.
-        
-        Args:
-            risk_factors: List of top risk factors
-            
-        Returns:
-            List of explanation strings
-        """
-        explanations = []
-        
-        for factor in risk_factors:
-            feature = factor['feature']
-            value = factor['value']
-            
-            if "Attendance" in feature:
-                if value < 75:
-                    explanations.append(f"Low attendance ({value}%) - Below required 75%")
-                else:
-                    explanations.append(f"Attendance at {value}% - Could be improved")
-            elif "Assessment" in feature or "Assignment" in feature or "Internal" in feature:
-                if value < 60:
-                    explanations.append(f"{feature} is low ({value}) - Below passing threshold")
-                else:
-                    explanations.append(f"{feature} at {value} - Room for improvement")
-            elif "GPA" in feature:
-                if value < 6.0:
-                    explanations.append(f"Low previous GPA ({value}) - Academic support needed")
-                else:
-                    explanations.append(f"Previous GPA at {value} - Maintain consistency")
-        
-        return explanations
 
 
 # Global instance
 ml_service = MLModelService()
+
+
+if __name__ == "__main__":
+    # Export MODEL_PATH to MODEL_MMAP_PATH before starting the workers:
+    #   MODEL_MMAP_PATH=models/student_xgboost_model.flat python -m app.services.ml_service
+    if not settings.MODEL_MMAP_PATH:
+        raise SystemExit("Set MODEL_MMAP_PATH to the file to export to")
+    ml_service.load_model()
+    if not ml_service.ready or not Path(settings.MODEL_MMAP_PATH).exists():
+        raise SystemExit(1)
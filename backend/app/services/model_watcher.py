@@ -0,0 +1,70 @@
+import asyncio
+from pathlib import Path
+from typing import Optional, Tuple
+from app.core.config import settings
+from app.services.ml_service import MLModelService, ml_service
+
+
+class ModelWatcher:
+    """
+    Polls the active model file and hot-reloads the model when it changes.
+
+    The reload (load, canary validation, atomic swap) runs on a worker
+    thread, so the event loop keeps serving requests with the old model
+    until the new one is ready.
+    """
+
+    def __init__(self, service: MLModelService, interval_seconds: float = 0):
+        self.service = service
+        self.interval_seconds = interval_seconds
+        self._task: Optional[asyncio.Task] = None
+        self._last_seen: Optional[Tuple[float, int]] = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.interval_seconds > 0
+
+    def _watched_path(self) -> Path:
+        return Path(self.service.model_path or settings.MODEL_PATH)
+
+    def _file_signature(self) -> Optional[Tuple[float, int]]:
+        try:
+            stat = self._watched_path().stat()
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime, stat.st_size
+
+    async def start(self):
+        """Start polling if an interval is configured."""
+        if not self.enabled or self._task is not None:
+            return
+        self._last_seen = self._file_signature()
+        self._task = asyncio.create_task(self._watch())
+        print(f"Watching {self._watched_path()} for model changes every {self.interval_seconds:g}s")
+
+    async def stop(self):
+        """Stop polling."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _watch(self):
+        while True:
+            await asyncio.sleep(self.interval_seconds)
+            signature = self._file_signature()
+            if signature is None or signature == self._last_seen:
+                continue
+            self._last_seen = signature
+            try:
+                await asyncio.to_thread(self.service.reload_model, str(self._watched_path()))
+            except Exception as e:
+                print(f"Model reload failed, keeping version {self.service.model_version}: {e}")
+
+
+# Global instance
+model_watcher = ModelWatcher(ml_service, interval_seconds=settings.MODEL_WATCH_INTERVAL_SECONDS)
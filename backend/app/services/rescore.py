@@ -0,0 +1,187 @@
+"""
+Resumable bulk re-scoring of the students collection.
+
+Streams students in _id order, predicts each batch with one model call and
+writes the results with version-guarded updates, checkpointing the last _id after
+every batch so an interrupted job can resume. Writes are throttled to
+max_ops_per_second so the job does not starve live traffic.
+
+Run from the backend directory:
+
+    python -m app.services.rescore [--batch-size N] [--ops-per-second N] [--all]
+    python -m app.services.rescore --resume <job_id>
+"""
+
+import argparse
+import asyncio
+import time
+from typing import Optional
+from app.core.config import settings
+from app.models.rescore_job import RescoreJobModel
+from app.models.student import StudentModel
+from app.services.inference_dispatcher import inference_dispatcher
+from app.services.ml_service import ml_service
+
+# Keeps references to running jobs so they are not garbage collected
+_running_jobs: set = set()
+
+
+async def create_job(
+    batch_size: Optional[int] = None,
+    max_ops_per_second: Optional[float] = None,
+    only_stale: bool = True,
+    created_by: Optional[str] = None
+) -> dict:
+    """Create a re-score job and claim it for this process."""
+    job = await RescoreJobModel.create({
+        "batch_size": batch_size or settings.RESCORE_BATCH_SIZE,
+        "max_ops_per_second": settings.RESCORE_MAX_OPS_PER_SECOND if max_ops_per_second is None else max_ops_per_second,
+        "only_stale": only_stale,
+        "created_by": created_by
+    })
+    return await claim_job(job["_id"])
+
+
+async def claim_job(job_id: str) -> Optional[dict]:
+    """Claim an existing, unfinished job. Returns None if it is completed or owned by a live runner."""
+    return await RescoreJobModel.claim(job_id, settings.RESCORE_STALE_AFTER_SECONDS)
+
+
+async def run_rescore(job: dict):
+    """
+    Run (or resume) a claimed re-score job until the collection is exhausted.
+
+    Args:
+        job: Job document returned by create_job/claim_job
+    """
+    job_id = str(job["_id"])
+    batch_size = job["batch_size"]
+    max_ops_per_second = job["max_ops_per_second"]
+    features = ml_service.feature_names
+
+    filters = {}
+    if job["only_stale"] and ml_service.model_version:
+        # Students already scored by the active model need no work
+        filters["model_version"] = {"$ne": ml_service.model_version}
+
+    cursor = StudentModel.iter_after_id(
+        last_id=job.get("last_id"),
+        filters=filters,
+        projection={name: 1 for name in features + ["version"]},
+        batch_size=batch_size
+    )
+
+    print(f"Re-score job {job_id} started (batch {batch_size}, "
+          f"{max_ops_per_second or 'unlimited'} ops/s, resume after {job.get('last_id')})")
+    try:
+        batch = []
+        async for student in cursor:
+            batch.append(student)
+            if len(batch) >= batch_size:
+                await _rescore_batch(job_id, batch, max_ops_per_second)
+                batch = []
+        if batch:
+            await _rescore_batch(job_id, batch, max_ops_per_second)
+
+        await RescoreJobModel.finish(job_id, "completed")
+        print(f"Re-score job {job_id} completed")
+    except asyncio.CancelledError:
+        await RescoreJobModel.finish(job_id, "interrupted", message="Cancelled")
+        raise
+    except Exception as e:
+        print(f"Re-score job {job_id} failed: {e}")
+        await RescoreJobModel.finish(job_id, "failed", message=str(e))
+
+
+async def _rescore_batch(job_id: str, batch: list, max_ops_per_second: float):
+    """Predict one batch, write it with StudentModel.bulk_set and checkpoint."""
+    started = time.monotonic()
+    features = ml_service.feature_names
+
+    # Documents with missing or non-numeric features cannot be scored
+    scorable = [
+        student for student in batch
+        if all(isinstance(student.get(name), (int, float)) for name in features)
+    ]
+
+    updated = conflicts = 0
+    if scorable:
+        predictions = await inference_dispatcher.predict_many(
+            [{name: student[name] for name in features} for student in scorable],
+            include_factors=False
+        )
+        # Students edited since they were read keep the edit's score; a later
+        # job picks them up if they are still stale
+        updated, conflicts = await StudentModel.bulk_set([
+            (student["_id"], {
+                "dropout_probability": prediction["dropout_probability"],
+                "risk_score": prediction["risk_score"],
+                "risk_level": prediction["risk_level"],
+                "model_version": prediction["model_version"]
+            }, student.get("version"))
+            for student, prediction in zip(scorable, predictions)
+        ])
+
+    await RescoreJobModel.checkpoint(
+        job_id,
+        last_id=batch[-1]["_id"],
+        processed=len(batch),
+        updated=updated,
+        skipped=len(batch) - len(scorable),
+        conflicts=conflicts
+    )
+
+    # Throttle: a batch of N writes takes at least N / max_ops_per_second seconds
+    if max_ops_per_second:
+        remaining = len(scorable) / max_ops_per_second - (time.monotonic() - started)
+        if remaining > 0:
+            await asyncio.sleep(remaining)
+
+
+def start_rescore(job: dict) -> asyncio.Task:
+    """Run a claimed job in the background on the current event loop."""
+    task = asyncio.create_task(run_rescore(job))
+    _running_jobs.add(task)
+    task.add_done_callback(_running_jobs.discard)
+    return task
+
+
+async def _main(args: argparse.Namespace):
+    from app.core.database import connect_to_mongo, close_mongo_connection
+
+    await connect_to_mongo()
+    await asyncio.to_thread(ml_service.load_model)
+    try:
+        if args.resume:
+            job = await claim_job(args.resume)
+            if job is None:
+                print(f"Job {args.resume} not found, already completed, or running elsewhere")
+                return
+        else:
+            job = await create_job(
+                batch_size=args.batch_size,
+                max_ops_per_second=args.ops_per_second,
+                only_stale=not args.all,
+                created_by="cli"
+            )
+            print(f"Created re-score job {job['_id']}")
+
+        await run_rescore(job)
+        print(await RescoreJobModel.get_by_id(str(job["_id"])))
+    finally:
+        await inference_dispatcher.stop()
+        await close_mongo_connection()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Re-score all stored students with the current model.")
+    parser.add_argument("--resume", metavar="JOB_ID", help="Resume an interrupted job")
+    parser.add_argument("--batch-size", type=int, help=f"Students per batch (default {settings.RESCORE_BATCH_SIZE})")
+    parser.add_argument("--ops-per-second", type=float,
+                        help=f"Write throttle, 0 = unlimited (default {settings.RESCORE_MAX_OPS_PER_SECOND})")
+    parser.add_argument("--all", action="store_true", help="Also re-score students already scored by the active model")
+    asyncio.run(_main(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+import csv
+import io
+import json
+from datetime import datetime
+from typing import AsyncIterator, List
+from bson import ObjectId
+
+EXPORT_FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+def _to_json_value(value):
+    if isinstance(value, ObjectId):
+        return str(value)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+async def stream_ndjson(cursor, fields: List[str], batch_size: int) -> AsyncIterator[bytes]:
+    """Encode documents as one JSON object per line, yielding about one chunk per cursor batch."""
+    lines = []
+    async for document in cursor:
+        lines.append(json.dumps({field: _to_json_value(document.get(field)) for field in fields}))
+        if len(lines) >= batch_size:
+            yield ("\n".join(lines) + "\n").encode()
+            lines = []
+    if lines:
+        yield ("\n".join(lines) + "\n").encode()
+
+
+async def stream_csv(cursor, fields: List[str], batch_size: int) -> AsyncIterator[bytes]:
+    """Encode documents as CSV with a header row, yielding about one chunk per cursor batch."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(fields)
+
+    rows = 0
+    async for document in cursor:
+        writer.writerow([
+            "" if document.get(field) is None else _to_json_value(document.get(field))
+            for field in fields
+        ])
+        rows += 1
+        if rows >= batch_size:
+            yield buffer.getvalue().encode()
+            buffer.seek(0)
+            buffer.truncate()
+            rows = 0
+    if buffer.tell():
+        yield buffer.getvalue().encode()
@@ -0,0 +1,198 @@
+import asyncio
+import csv
+import io
+import json
+import tempfile
+from typing import Iterator, List, Optional, Tuple
+from pydantic import ValidationError
+from app.core.config import settings
+from app.models.import_job import ImportJobModel
+from app.models.student import StudentModel
+from app.schemas.student import StudentCreate
+from app.services.inference_dispatcher import inference_dispatcher
+
+IMPORT_FORMATS = {
+    "text/csv": "csv",
+    "application/csv": "csv",
+    "application/x-ndjson": "jsonl",
+    "application/jsonl": "jsonl",
+    "application/json-lines": "jsonl",
+    "application/x-jsonlines": "jsonl",
+}
+
+# Keeps references to running imports so they are not garbage collected
+_running_imports: set = set()
+
+
+def detect_format(content_type: Optional[str], requested: Optional[str] = None) -> Optional[str]:
+    """Resolve the upload format from an explicit value or the Content-Type header."""
+    if requested:
+        return requested
+    if content_type:
+        return IMPORT_FORMATS.get(content_type.split(";")[0].strip().lower())
+    return None
+
+
+async def spool_body(stream) -> tempfile.SpooledTemporaryFile:
+    """
+    Copy a streamed request body into a spooled temp file (memory first,
+    disk once it grows past IMPORT_SPOOL_MAX_BYTES).
+    """
+    spool = tempfile.SpooledTemporaryFile(max_size=settings.IMPORT_SPOOL_MAX_BYTES)
+    async for chunk in stream:
+        spool.write(chunk)
+    spool.seek(0)
+    return spool
+
+
+def _iter_rows(text: io.TextIOBase, fmt: str) -> Iterator[Tuple[int, Optional[dict], Optional[str]]]:
+    """
+    Yield (row_number, row, parse_error) for each record. Row numbers are
+    1-based data rows (the CSV header is not counted).
+    """
+    if fmt == "csv":
+        for row_number, row in enumerate(csv.DictReader(text), start=1):
+            # DictReader collects cells beyond the header under the None key
+            extra = row.pop(None, None)
+            # Empty CSV cells mean "not provided"
+            row = {key: (value if value != "" else None) for key, value in row.items()}
+            if extra is not None:
+                yield row_number, row, f"Unexpected extra columns ({len(extra)} more than the header)"
+                continue
+            yield row_number, row, None
+        return
+
+    row_number = 0
+    for line in text:
+        if not line.strip():
+            continue
+        row_number += 1
+        try:
+            row = json.loads(line)
+        except json.JSONDecodeError as e:
+            yield row_number, None, f"Invalid JSON: {e.msg}"
+            continue
+        if not isinstance(row, dict):
+            yield row_number, None, "Each line must be a JSON object"
+            continue
+        yield row_number, row, None
+
+
+def _error(row_number: int, row: Optional[dict], messages: List[str]) -> dict:
+    return {
+        "row": row_number,
+        "roll_number": row.get("roll_number") if isinstance(row, dict) else None,
+        "errors": messages
+    }
+
+
+def _validate_chunk(rows: Iterator, chunk_size: int) -> Tuple[int, List[Tuple[int, StudentCreate]], List[dict]]:
+    """
+    Read and validate up to chunk_size rows (runs on a worker thread).
+
+    Returns:
+        Tuple of (rows read, [(row_number, student), ...], row errors)
+    """
+    valid, errors = [], []
+    read = 0
+    for row_number, row, parse_error in rows:
+        read += 1
+        if parse_error:
+            errors.append(_error(row_number, row, [parse_error]))
+        else:
+            try:
+                valid.append((row_number, StudentCreate(**row)))
+            except ValidationError as e:
+                errors.append(_error(row_number, row, [
+                    f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}"
+                    for error in e.errors()
+                ]))
+            except TypeError as e:
+                # Malformed record (e.g. non-string keys); fail the row, not the import
+                errors.append(_error(row_number, row, [f"Invalid row: {e}"]))
+        if read >= chunk_size:
+            break
+    return read, valid, errors
+
+
+async def _import_chunk(valid: List[Tuple[int, StudentCreate]], seen_roll_numbers: set) -> Tuple[int, List[dict]]:
+    """Deduplicate, score and insert one chunk of validated students."""
+    errors = []
+
+    # Duplicates within this import and against stored students
+    candidates = []
+    for row_number, student in valid:
+        if student.roll_number in seen_roll_numbers:
+            errors.append(_error(row_number, student.model_dump(), ["Duplicate roll number in upload"]))
+        else:
+            seen_roll_numbers.add(student.roll_number)
+            candidates.append((row_number, student))
+
+    existing = await StudentModel.get_existing_roll_numbers([s.roll_number for _, s in candidates])
+    to_insert = []
+    for row_number, student in candidates:
+        if student.roll_number in existing:
+            errors.append(_error(row_number, student.model_dump(), ["Student with this roll number already exists"]))
+        else:
+            to_insert.append((row_number, student))
+
+    if not to_insert:
+        return 0, errors
+
+    # One vectorized model call for the whole chunk
+    documents = [student.model_dump() for _, student in to_insert]
+    predictions = await inference_dispatcher.predict_many(documents, include_factors=False)
+    for document, prediction in zip(documents, predictions):
+        document["dropout_probability"] = prediction["dropout_probability"]
+        document["risk_score"] = prediction["risk_score"]
+        document["risk_level"] = prediction["risk_level"]
+        document["model_version"] = prediction["model_version"]
+
+    inserted_count, write_errors = await StudentModel.create_many(documents)
+    for index, message in write_errors:
+        row_number, student = to_insert[index]
+        errors.append(_error(row_number, student.model_dump(), [message]))
+
+    return inserted_count, errors
+
+
+async def run_import(job_id: str, spool: tempfile.SpooledTemporaryFile, fmt: str):
+    """
+    Validate, score and insert all rows of a spooled upload chunk by chunk,
+    recording progress on the import job.
+    """
+    try:
+        text = io.TextIOWrapper(spool, encoding="utf-8-sig", newline="")
+        rows = _iter_rows(text, fmt)
+        seen_roll_numbers: set = set()
+
+        while True:
+            read, valid, errors = await asyncio.to_thread(_validate_chunk, rows, settings.IMPORT_CHUNK_SIZE)
+            if read == 0:
+                break
+
+            inserted_count, chunk_errors = await _import_chunk(valid, seen_roll_numbers)
+            errors.extend(chunk_errors)
+            errors.sort(key=lambda error: error["row"])
+            await ImportJobModel.record_progress(
+                job_id,
+                processed_rows=read,
+                inserted_count=inserted_count,
+                errors=errors,
+                max_errors=settings.IMPORT_MAX_REPORTED_ERRORS
+            )
+
+        await ImportJobModel.finish(job_id, "completed")
+    except Exception as e:
+        print(f"Import {job_id} failed: {e}")
+        await ImportJobModel.finish(job_id, "failed", message=str(e))
+    finally:
+        spool.close()
+
+
+def start_import(job_id: str, spool: tempfile.SpooledTemporaryFile, fmt: str) -> asyncio.Task:
+    """Run an import in the background on the current event loop."""
+    task = asyncio.create_task(run_import(job_id, spool, fmt))
+    _running_imports.add(task)
+    task.add_done_callback(_running_imports.discard)
+    return task
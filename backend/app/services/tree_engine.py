@@ -0,0 +1,281 @@
+import json
+import mmap
+import os
+import struct
+import numpy as np
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+# Memory-mapped file layout: magic, header length (uint64 LE), JSON header,
+# then each node array at a 64-byte aligned offset from the data start
+MAPPED_MAGIC = b"XGBFLAT1"
+_PREFIX = struct.Struct("<8sQ")
+_ALIGNMENT = 64
+_ARRAYS = ("feature", "threshold", "left", "right", "default_left", "value", "roots")
+
+
+def _align(offset: int) -> int:
+    return -(-offset // _ALIGNMENT) * _ALIGNMENT
+
+
+class CompiledTreeEnsemble:
+    """
+    Flat NumPy representation of a binary:logistic XGBoost tree ensemble.
+
+    Every node of every tree is stored in parallel arrays (feature index,
+    threshold, left/right child, default direction and leaf value). Children
+    are global node indices and leaves point to themselves, so a batch can be
+    traversed for all trees at once with a fixed number of vectorized steps.
+    """
+
+    SUPPORTED_OBJECTIVES = ("binary:logistic",)
+
+    def __init__(
+        self,
+        feature: np.ndarray,
+        threshold: np.ndarray,
+        left: np.ndarray,
+        right: np.ndarray,
+        default_left: np.ndarray,
+        value: np.ndarray,
+        roots: np.ndarray,
+        max_depth: int,
+        base_margin: float
+    ):
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.default_left = default_left
+        self.value = value
+        self.roots = roots
+        self.max_depth = max_depth
+        self.base_margin = base_margin
+
+    @property
+    def n_trees(self) -> int:
+        return int(self.roots.shape[0])
+
+    @property
+    def n_nodes(self) -> int:
+        return int(self.feature.shape[0])
+
+    @classmethod
+    def from_booster(cls, booster, feature_names: List[str]) -> "CompiledTreeEnsemble":
+        """
+        Compile an ``xgboost.Booster`` into flat node arrays.
+
+        Args:
+            booster: Trained booster (e.g. ``XGBClassifier.get_booster()``)
+            feature_names: Column order of the matrices passed to ``predict_proba``
+
+        Returns:
+            Compiled ensemble
+        """
+        model = json.loads(booster.save_raw("json"))
+        learner = model["learner"]
+
+        objective = learner["objective"]["name"]
+        if objective not in cls.SUPPORTED_OBJECTIVES:
+            raise ValueError(f"Unsupported objective for compilation: {objective}")
+        if int(learner["learner_model_param"].get("num_class", "0")) > 1:
+            raise ValueError("Multi-class models are not supported for compilation")
+        if learner["gradient_booster"]["name"] != "gbtree":
+            raise ValueError(f"Unsupported booster: {learner['gradient_booster']['name']}")
+
+        # Map the booster's feature indices onto our column order
+        model_features = learner.get("feature_names") or feature_names
+        column_of = [feature_names.index(name) for name in model_features]
+
+        trees = learner["gradient_booster"]["model"]["trees"]
+        best_iteration = learner.get("attributes", {}).get("best_iteration")
+        if best_iteration is not None:
+            num_parallel_tree = int(
+                learner["gradient_booster"]["model"]["gbtree_model_param"]["num_parallel_tree"]
+            )
+            trees = trees[:(int(best_iteration) + 1) * num_parallel_tree]
+
+        features, thresholds, lefts, rights, defaults, values, roots = [], [], [], [], [], [], []
+        max_depth = 0
+        offset = 0
+        for tree in trees:
+            if any(tree["split_type"]):
+                raise ValueError("Categorical splits are not supported for compilation")
+
+            n_nodes = int(tree["tree_param"]["num_nodes"])
+            left = np.asarray(tree["left_children"], dtype=np.int64)
+            right = np.asarray(tree["right_children"], dtype=np.int64)
+            is_leaf = left == -1
+            node_ids = np.arange(n_nodes, dtype=np.int64)
+
+            split_index = np.asarray(tree["split_indices"], dtype=np.int64)
+            features.append(np.where(is_leaf, 0, np.asarray(column_of)[split_index]))
+            conditions = np.asarray(tree["split_conditions"], dtype=np.float32)
+            # Leaves keep their weight in split_conditions
+            thresholds.append(np.where(is_leaf, np.float32(0), conditions))
+            values.append(np.where(is_leaf, conditions, np.float32(0)))
+            lefts.append(np.where(is_leaf, node_ids, left) + offset)
+            rights.append(np.where(is_leaf, node_ids, right) + offset)
+            defaults.append(np.asarray(tree["default_left"], dtype=bool))
+            roots.append(offset)
+
+            max_depth = max(max_depth, cls._tree_depth(left, right))
+            offset += n_nodes
+
+        base_score = float(learner["learner_model_param"]["base_score"])
+        base_margin = float(np.log(base_score / (1.0 - base_score)))
+
+        return cls(
+            feature=np.concatenate(features).astype(np.int64),
+            threshold=np.concatenate(thresholds).astype(np.float32),
+            left=np.concatenate(lefts),
+            right=np.concatenate(rights),
+            default_left=np.concatenate(defaults),
+            value=np.concatenate(values).astype(np.float32),
+            roots=np.asarray(roots, dtype=np.int64),
+            max_depth=max_depth,
+            base_margin=base_margin
+        )
+
+    @staticmethod
+    def _tree_depth(left: np.ndarray, right: np.ndarray) -> int:
+        """Depth of a tree given its local child arrays."""
+        depth = 0
+        frontier = [0]
+        while True:
+            children = [c for node in frontier for c in (left[node], right[node]) if c != -1]
+            if not children:
+                return depth
+            frontier = children
+            depth += 1
+
+    def predict_margin(self, X: np.ndarray) -> np.ndarray:
+        """
+        Raw (log-odds) scores for an (N, F) matrix.
+
+        Inputs are compared as float32, matching XGBoost. NaN follows the
+        node's default direction.
+        """
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+
+        rows = np.arange(X.shape[0])[:, None]
+        nodes = np.broadcast_to(self.roots, (X.shape[0], self.n_trees))
+        for _ in range(self.max_depth):
+            x = X[rows, self.feature[nodes]]
+            go_left = np.where(np.isnan(x), self.default_left[nodes], x < self.threshold[nodes])
+            nodes = np.where(go_left, self.left[nodes], self.right[nodes])
+
+        return self.value[nodes].sum(axis=1, dtype=np.float64) + self.base_margin
+
+    def predict_proba(self, X: np.ndarray) -> np.ndarray:
+        """
+        Class probabilities for an (N, F) matrix, shaped like
+        ``XGBClassifier.predict_proba`` (columns: not dropout, dropout).
+        """
+        positive = 1.0 / (1.0 + np.exp(-self.predict_margin(X)))
+        return np.column_stack([1.0 - positive, positive])
+
+    def save(self, path: Path, metadata: Optional[dict] = None):
+        """
+        Write the node arrays to a file that ``load_mapped`` can map read-only.
+
+        The file is written next to ``path`` and renamed into place, so
+        processes mapping the previous file keep a consistent view.
+        """
+        path = Path(path)
+        layout, offset = {}, 0
+        for name in _ARRAYS:
+            array = getattr(self, name)
+            offset = _align(offset)
+            layout[name] = {"dtype": array.dtype.str, "shape": list(array.shape), "offset": offset}
+            offset += array.nbytes
+
+        header = json.dumps({
+            "max_depth": self.max_depth,
+            "base_margin": self.base_margin,
+            "arrays": layout,
+            "metadata": metadata or {}
+        }).encode()
+        data_start = _align(_PREFIX.size + len(header))
+
+        temporary = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        with open(temporary, "wb") as file:
+            file.write(_PREFIX.pack(MAPPED_MAGIC, len(header)))
+            file.write(header)
+            for name in _ARRAYS:
+                file.seek(data_start + layout[name]["offset"])
+                file.write(np.ascontiguousarray(getattr(self, name)).tobytes())
+            file.truncate(data_start + offset)
+        os.replace(temporary, path)
+
+    @classmethod
+    def load_mapped(cls, path: Path) -> Tuple["CompiledTreeEnsemble", dict]:
+        """
+        Map a file written by ``save``. The arrays are read-only views of the
+        mapping, so every process mapping the same file shares its pages.
+
+        Raises:
+            ValueError: If the file is not a mapped tree ensemble
+
+        Returns:
+            Tuple of (ensemble, metadata passed to save)
+        """
+        with open(path, "rb") as file:
+            buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if len(buffer) < _PREFIX.size:
+            raise ValueError(f"{path} is not a mapped tree ensemble")
+        magic, header_length = _PREFIX.unpack_from(buffer)
+        if magic != MAPPED_MAGIC:
+            raise ValueError(f"{path} is not a mapped tree ensemble")
+        header = json.loads(buffer[_PREFIX.size:_PREFIX.size + header_length])
+        data_start = _align(_PREFIX.size + header_length)
+
+        arrays = {}
+        for name in _ARRAYS:
+            spec = header["arrays"][name]
+            dtype = np.dtype(spec["dtype"])
+            count = int(np.prod(spec["shape"], dtype=np.int64))
+            # Each view keeps a reference to the mapping, which stays open as long as it is used
+            arrays[name] = np.frombuffer(
+                buffer, dtype=dtype, count=count, offset=data_start + spec["offset"]
+            ).reshape(spec["shape"])
+
+        ensemble = cls(**arrays, max_depth=header["max_depth"], base_margin=header["base_margin"])
+        return ensemble, header["metadata"]
+
+    def max_abs_error(self, model, X: np.ndarray) -> float:
+        """Largest absolute difference from ``model.predict_proba`` on ``X``."""
+        expected = np.asarray(model.predict_proba(X), dtype=np.float64)[:, 1]
+        return float(np.max(np.abs(self.predict_proba(X)[:, 1] - expected)))
+
+
+def compile_model(model, feature_names: List[str]) -> Optional[CompiledTreeEnsemble]:
+    """
+    Compile a loaded model if it exposes an XGBoost booster.
+
+    Returns:
+        Compiled ensemble, or None if the model cannot be compiled
+    """
+    if not hasattr(model, "get_booster"):
+        return None
+    return CompiledTreeEnsemble.from_booster(model.get_booster(), feature_names)
+
+
+class MappedTreeModel:
+    """
+    Stand-in for the XGBoost model when only a mapped ensemble is loaded.
+
+    Provides ``predict_proba`` and ``feature_importances_``; there is no
+    booster, so per-student SHAP contributions are not available.
+    """
+
+    def __init__(self, compiled: CompiledTreeEnsemble, feature_importances: Optional[List[float]] = None):
+        self.compiled = compiled
+        if feature_importances is not None:
+            self.feature_importances_ = np.asarray(feature_importances, dtype=np.float32)
+
+    def predict_proba(self, X: np.ndarray) -> np.ndarray:
+        return self.compiled.predict_proba(X)
@@ -0,0 +1,154 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Set, Tuple
+from app.core.config import settings
+from app.core.security import decode_access_token
+
+
+class UserCache:
+    """
+    In-process TTL cache of authenticated users and decoded tokens.
+
+    Users are cached by username (without the password hash) for at most
+    ``ttl_seconds``; token payloads are cached by token until the earlier of
+    the TTL and the token's own expiry. Concurrent misses for one username
+    share a single database lookup. ``invalidate`` drops a user immediately
+    and prevents an in-flight lookup from re-caching the old record.
+
+    The cache is per process: with several workers, a change made through one
+    worker reaches the others after at most ``ttl_seconds``.
+    """
+
+    def __init__(self, max_size: int = 10000, ttl_seconds: float = 30):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._users: "OrderedDict[str, Tuple[float, dict]]" = OrderedDict()
+        self._tokens: "OrderedDict[str, Tuple[float, dict]]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Future] = {}
+        # Usernames invalidated while their lookup is in flight (never outlives the lookup)
+        self._invalidated: Set[str] = set()
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0 and self.ttl_seconds > 0
+
+    def _get(self, entries: OrderedDict, key: str) -> Optional[Any]:
+        entry = entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del entries[key]
+            return None
+        entries.move_to_end(key)
+        return value
+
+    def _set(self, entries: OrderedDict, key: str, value: Any, ttl_seconds: float):
+        entries[key] = (time.monotonic() + ttl_seconds, value)
+        entries.move_to_end(key)
+        while len(entries) > self.max_size:
+            entries.popitem(last=False)
+
+    def decode_token(self, token: str) -> Optional[dict]:
+        """Decode a JWT, reusing the payload of a recently seen token."""
+        if not self.enabled:
+            return decode_access_token(token)
+
+        payload = self._get(self._tokens, token)
+        if payload is not None:
+            return payload
+
+        payload = decode_access_token(token)
+        if payload is not None:
+            ttl_seconds = self.ttl_seconds
+            if payload.get("exp") is not None:
+                ttl_seconds = min(ttl_seconds, payload["exp"] - time.time())
+            if ttl_seconds > 0:
+                self._set(self._tokens, token, payload, ttl_seconds)
+        return payload
+
+    async def get_user(self, username: str, loader: Callable[[str], Awaitable[Optional[dict]]]) -> Optional[dict]:
+        """
+        Get a user record, loading it with ``loader`` on a miss. Unknown users
+        are not cached, so a newly registered user is found immediately. If
+        the lookup a caller joined is cancelled, the caller retries it.
+        """
+        if not self.enabled:
+            return await loader(username)
+
+        while True:
+            user = self._get(self._users, username)
+            if user is not None:
+                self.hits += 1
+                return user
+
+            inflight = self._inflight.get(username)
+            if inflight is None:
+                break
+            self.coalesced += 1
+            try:
+                return await asyncio.shield(inflight)
+            except asyncio.CancelledError:
+                # Only the leading lookup was cancelled, not this caller
+                if not inflight.cancelled():
+                    raise
+
+        self.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[username] = future
+        try:
+            user = await loader(username)
+            if user is not None:
+                user = {key: value for key, value in user.items() if key != "hashed_password"}
+                if username not in self._invalidated:
+                    self._set(self._users, username, user, self.ttl_seconds)
+            future.set_result(user)
+            return user
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Mark retrieved so an unawaited failure is not logged as never retrieved
+            future.exception()
+            raise
+        finally:
+            del self._inflight[username]
+            self._invalidated.discard(username)
+
+    def invalidate(self, username: str):
+        """Drop a user after it was changed or deactivated."""
+        self._users.pop(username, None)
+        if username in self._inflight:
+            self._invalidated.add(username)
+
+    def clear(self):
+        """Drop all cached users and tokens (counters are kept)."""
+        self._users.clear()
+        self._invalidated.update(self._inflight)
+        self._tokens.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters for monitoring."""
+        lookups = self.hits + self.misses + self.coalesced
+        return {
+            "enabled": self.enabled,
+            "users": len(self._users),
+            "tokens": len(self._tokens),
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "hit_rate": (self.hits + self.coalesced) / lookups if lookups else 0.0
+        }
+
+
+# Global instance
+user_cache = UserCache(
+    max_size=settings.USER_CACHE_SIZE,
+    ttl_seconds=settings.USER_CACHE_TTL_SECONDS
+)
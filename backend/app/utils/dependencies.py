@@ -1,8 +1,9 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from app.core.security import decode_access_token
+from app.core.config import settings
 from app.models.user import UserModel
 from app.schemas.user import User
+from app.services.user_cache import user_cache
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
 
@@ -10,6 +11,9 @@ oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
 async def get_current_user(token: str = Depends(oauth2_scheme)) -> User:
     """
     Get current authenticated user from JWT token.
+    
+    Decoded tokens and user records are served from the in-process user
+    cache, so most requests need no database round trip.
     """
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -17,7 +21,7 @@ async def get_current_user(token: str = Depends(oauth2_scheme)) -> User:
         headers={"WWW-Authenticate": "Bearer"},
     )
     
-    payload = decode_access_token(token)
+    payload = user_cache.decode_token(token)
     if payload is None:
         raise credentials_exception
     
@@ -25,7 +29,7 @@ async def get_current_user(token: str = Depends(oauth2_scheme)) -> User:
     if username is None:
         raise credentials_exception
     
-    user = await UserModel.get_by_username(username)
+    user = await user_cache.get_user(username, UserModel.get_by_username)
     if user is None:
         raise credentials_exception
     
@@ -46,3 +50,15 @@ async def get_current_active_user(current_user: User = Depends(get_current_user)
     if not current_user.is_active:
         raise HTTPException(status_code=400, detail="Inactive user")
     return current_user
+
+
+async def get_current_admin_user(current_user: User = Depends(get_current_active_user)) -> User:
+    """
+    Get current user and require them to be listed in ADMIN_USERNAMES.
+    """
+    if current_user.username not in settings.ADMIN_USERNAMES:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin privileges required"
+        )
+    return current_user
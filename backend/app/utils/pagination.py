@@ -0,0 +1,63 @@
+import base64
+from typing import Any, List, Optional, Tuple
+from bson import ObjectId, json_util
+
+
+def encode_cursor(sort_field: str, descending: bool, value: Any, last_id: str) -> str:
+    """Opaque token for the position after (value, last_id) in a sort order."""
+    payload = json_util.dumps({"s": sort_field, "d": descending, "v": value, "id": last_id})
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(token: str, sort_field: str, descending: bool) -> Tuple[Any, ObjectId]:
+    """
+    Decode a cursor token for the given sort order.
+
+    Raises:
+        ValueError: If the token is malformed or was issued for another sort order
+    """
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        payload = json_util.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+        value, last_id = payload["v"], ObjectId(payload["id"])
+        issued_for = (payload["s"], payload["d"])
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+    if issued_for != (sort_field, descending):
+        raise ValueError("Cursor was issued for a different sort order")
+    return value, last_id
+
+
+def keyset_filter(sort_field: str, descending: bool, value: Any, last_id: ObjectId) -> dict:
+    """
+    Filter matching documents strictly after (value, last_id) when sorted by
+    (sort_field, _id) in the given direction. Missing/null sort values sort
+    before all others in MongoDB, i.e. last when descending.
+    """
+    op = "$lt" if descending else "$gt"
+    branches: List[dict] = []
+    if value is None:
+        branches.append({sort_field: None, "_id": {op: last_id}})
+        if not descending:
+            branches.append({sort_field: {"$ne": None}})
+    else:
+        branches.append({sort_field: {op: value}})
+        branches.append({sort_field: value, "_id": {op: last_id}})
+        if descending:
+            branches.append({sort_field: None})
+    return {"$or": branches}
+
+
+def sort_spec(sort_field: str, descending: bool) -> List[Tuple[str, int]]:
+    """Stable (sort_field, _id) sort specification."""
+    direction = -1 if descending else 1
+    return [(sort_field, direction), ("_id", direction)]
+
+
+def next_cursor(items: List[dict], limit: int, sort_field: str, descending: bool) -> Optional[str]:
+    """Cursor after the last item if a further page exists (items holds limit + 1 rows)."""
+    if len(items) <= limit:
+        return None
+    last = items[limit - 1]
+    return encode_cursor(sort_field, descending, last.get(sort_field), str(last["_id"]))
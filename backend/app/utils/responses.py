@@ -0,0 +1,99 @@
+"""
+Fast JSON responses built straight from MongoDB documents.
+
+Returning a pydantic model from an endpoint makes FastAPI validate it a
+second time against ``response_model`` and then encode it with the standard
+library. Documents read from the database were already validated on the way
+in, so the hot read paths serialize them with orjson instead; endpoints keep
+``response_model`` so the OpenAPI schema is unchanged.
+"""
+
+from datetime import datetime
+from typing import Iterable, List, Optional
+import orjson
+from bson import ObjectId
+from fastapi.responses import ORJSONResponse
+from app.schemas.student import PredictionResponse, RiskFactor, Student, StudentSummary
+
+# Output keys in schema order, using the alias ("_id") like FastAPI does
+STUDENT_FIELDS = [field.alias or name for name, field in Student.model_fields.items()]
+SUMMARY_FIELDS = [field.alias or name for name, field in StudentSummary.model_fields.items()]
+PREDICTION_FIELDS = [name for name in PredictionResponse.model_fields if name != "timestamp"]
+RISK_FACTOR_FIELDS = list(RiskFactor.model_fields)
+
+_OPTIONS = orjson.OPT_SERIALIZE_NUMPY
+
+
+def _default(value):
+    if isinstance(value, ObjectId):
+        return str(value)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+class FastJSONResponse(ORJSONResponse):
+    """ORJSONResponse that also encodes ObjectId and numpy values."""
+
+    def render(self, content) -> bytes:
+        return orjson.dumps(content, default=_default, option=_OPTIONS)
+
+
+def resolve_student_fields(fields: Optional[str]) -> List[str]:
+    """
+    Parse the ``fields`` query parameter: empty for every Student field,
+    ``summary`` for the StudentSummary fields, or a comma-separated list of
+    Student fields (_id is always returned first).
+
+    Raises:
+        ValueError: If an unknown field is requested
+    """
+    if not fields:
+        return STUDENT_FIELDS
+    if fields == "summary":
+        return SUMMARY_FIELDS
+
+    requested = [field.strip() for field in fields.split(",") if field.strip()]
+    unknown = [field for field in requested if field not in STUDENT_FIELDS]
+    if unknown:
+        raise ValueError(f"Unknown field(s): {', '.join(unknown)}")
+    return ["_id"] + [field for field in dict.fromkeys(requested) if field != "_id"]
+
+
+def student_document(student: dict, fields: List[str] = STUDENT_FIELDS) -> dict:
+    """Shape a stored student like the Student schema (missing optionals are null)."""
+    return {field: student.get(field) for field in fields}
+
+
+def student_response(student: dict, status_code: int = 200) -> FastJSONResponse:
+    return FastJSONResponse(student_document(student), status_code=status_code)
+
+
+def students_response(
+    students: Iterable[dict],
+    headers: Optional[dict] = None,
+    fields: List[str] = STUDENT_FIELDS
+) -> FastJSONResponse:
+    return FastJSONResponse([student_document(student, fields) for student in students], headers=headers)
+
+
+def prediction_document(prediction: dict) -> dict:
+    """Shape a model prediction like PredictionResult."""
+    document = {field: prediction.get(field) for field in PREDICTION_FIELDS}
+    document["risk_factors"] = [
+        {field: factor[field] for field in RISK_FACTOR_FIELDS}
+        for factor in prediction.get("risk_factors") or []
+    ]
+    return document
+
+
+def prediction_response(prediction: dict) -> FastJSONResponse:
+    content = prediction_document(prediction)
+    content["timestamp"] = datetime.utcnow()
+    return FastJSONResponse(content)
+
+
+def predictions_response(predictions: List[dict]) -> FastJSONResponse:
+    return FastJSONResponse({
+        "count": len(predictions),
+        "predictions": [prediction_document(prediction) for prediction in predictions],
+        "timestamp": datetime.utcnow()
+    })
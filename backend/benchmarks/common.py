@@ -0,0 +1,68 @@
+"""Shared setup for the benchmarks: in-memory MongoDB, sample model and an in-process client."""
+
+import importlib.util
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import AsyncIterator, Iterable
+import numpy as np
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+FEATURES = {
+    "attendance_percentage": 65.0,
+    "assessment_score": 55.0,
+    "assignment_score": 60.0,
+    "internal_marks": 58.0,
+    "previous_semester_gpa": 6.2,
+}
+
+
+def use_in_memory_database():
+    """Make connect_to_mongo use mongomock-motor instead of a real server."""
+    try:
+        from mongomock_motor import AsyncMongoMockClient
+    except ImportError:
+        raise SystemExit("mongomock-motor is required: pip install -r requirements-dev.txt")
+    from app.core import database
+    database.AsyncIOMotorClient = lambda *args, **kwargs: AsyncMongoMockClient()
+
+
+def ensure_sample_model():
+    """Create the sample model with models/create_sample_model.py if MODEL_PATH does not exist."""
+    from app.core.config import settings
+
+    if (BACKEND_DIR / settings.MODEL_PATH).exists() or Path(settings.MODEL_PATH).exists():
+        return
+    spec = importlib.util.spec_from_file_location(
+        "create_sample_model", BACKEND_DIR / "models" / "create_sample_model.py"
+    )
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    module.create_sample_model()
+
+
+def percentiles(values_ms: Iterable[float]) -> dict:
+    """p50/p95/p99/max of latencies in milliseconds."""
+    values = np.asarray(list(values_ms), dtype=np.float64)
+    if values.size == 0:
+        return {}
+    return {
+        "p50": round(float(np.percentile(values, 50)), 2),
+        "p95": round(float(np.percentile(values, 95)), 2),
+        "p99": round(float(np.percentile(values, 99)), 2),
+        "max": round(float(values.max()), 2),
+    }
+
+
+@asynccontextmanager
+async def app_client() -> AsyncIterator:
+    """Start the app (lifespan included) on an in-memory database and yield an httpx client."""
+    use_in_memory_database()
+    ensure_sample_model()
+    import httpx
+    from app.main import app
+
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            yield client
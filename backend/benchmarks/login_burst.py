@@ -0,0 +1,91 @@
+"""
+Event-loop latency of /predict during a login burst, with passwords hashed
+inline on the event loop vs. on the password hashing pool.
+
+Runs the app in-process against an in-memory MongoDB (mongomock-motor, see
+requirements-dev.txt). From the backend directory:
+
+    python -m benchmarks.login_burst [--logins 40] [--concurrency 8] [--workers 2]
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from benchmarks.common import FEATURES, app_client, percentiles
+
+
+async def _monitor_loop_lag(samples: list, stop: asyncio.Event, interval: float = 0.005):
+    """Record how late a periodic timer fires; lateness means the loop was blocked."""
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(interval)
+        samples.append((time.perf_counter() - started - interval) * 1000)
+
+
+async def _run_mode(client, password_hasher, workers: int, logins: int, concurrency: int) -> dict:
+    password_hasher.shutdown()
+    password_hasher.max_workers = workers
+
+    login = {"username": "bench", "password": "bench-password"}
+    response = await client.post("/api/v1/auth/login/json", json=login)
+    headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+    await client.post("/api/v1/predict", json=FEATURES, headers=headers)
+
+    lag_samples, predict_latencies, login_statuses = [], [], []
+    stop = asyncio.Event()
+    monitor = asyncio.create_task(_monitor_loop_lag(lag_samples, stop))
+
+    async def one_login():
+        response = await client.post("/api/v1/auth/login/json", json=login)
+        login_statuses.append(response.status_code)
+
+    async def predict_worker():
+        # Keep /predict traffic flowing for as long as the burst lasts
+        while not stop.is_set():
+            started = time.perf_counter()
+            await client.post("/api/v1/predict", json=FEATURES, headers=headers)
+            predict_latencies.append((time.perf_counter() - started) * 1000)
+
+    predictors = [asyncio.create_task(predict_worker()) for _ in range(concurrency)]
+    started = time.perf_counter()
+    await asyncio.gather(*[one_login() for _ in range(logins)])
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await asyncio.gather(monitor, *predictors)
+
+    return {
+        "mode": "inline" if workers == 0 else f"pool ({workers} workers)",
+        "elapsed_s": round(elapsed, 3),
+        "logins_ok": login_statuses.count(200),
+        "logins_rejected": login_statuses.count(503),
+        "predicts_completed": len(predict_latencies),
+        "predict_latency_ms": percentiles(predict_latencies),
+        "event_loop_lag_ms": percentiles(lag_samples),
+    }
+
+
+async def run(logins: int, concurrency: int, workers: int) -> list:
+    from app.services.password_hasher import password_hasher
+
+    results = []
+    async with app_client() as client:
+        await client.post("/api/v1/auth/register", json={
+            "username": "bench", "email": "bench@example.com", "password": "bench-password"
+        })
+        for mode_workers in (0, workers):
+            results.append(await _run_mode(client, password_hasher, mode_workers, logins, concurrency))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure /predict latency during a login burst.")
+    parser.add_argument("--logins", type=int, default=40, help="Concurrent logins in the burst")
+    parser.add_argument("--concurrency", type=int, default=8, help="Concurrent /predict callers")
+    parser.add_argument("--workers", type=int, default=2, help="Password hashing pool size for the pooled run")
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(run(args.logins, args.concurrency, args.workers)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Per-worker memory and start-up cost of loading the model from MODEL_PATH vs.
+mapping the exported tree arrays (MODEL_MMAP_PATH).
+
+Each mode runs in a fresh interpreter, like a new uvicorn worker, which loads
+the model and scores the canary batch. Resident memory is read from
+/proc/self/status (Linux): RssAnon is private to the worker, RssFile
+includes the mapped model file whose pages all workers share. From the
+backend directory:
+
+    python -m benchmarks.model_memory [--mmap-path models/student_xgboost_model.flat]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+from benchmarks.common import BACKEND_DIR, ensure_sample_model
+
+_WORKER = """
+import json, time
+started = time.perf_counter()
+from app.services.ml_service import ml_service
+ml_service.load_model()
+ml_service.warm_up()
+elapsed_ms = (time.perf_counter() - started) * 1000
+status = dict(line.split(":", 1) for line in open("/proc/self/status"))
+memory = {key: int(status[key].split()[0]) // 1024 for key in ("VmRSS", "RssAnon", "RssFile")}
+print(json.dumps({"start_ms": round(elapsed_ms, 1), "mapped": ml_service.model_info()["mapped"],
+                  **{f"{key}_mb": value for key, value in memory.items()}}))
+"""
+
+
+def _worker(mmap_path: str) -> dict:
+    env = dict(os.environ, MODEL_MMAP_PATH=mmap_path)
+    output = subprocess.run(
+        [sys.executable, "-c", _WORKER], cwd=BACKEND_DIR, env=env,
+        capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare per-worker model memory with and without MODEL_MMAP_PATH.")
+    parser.add_argument("--mmap-path", default="models/student_xgboost_model.flat",
+                        help="File to export the compiled trees to (created if missing)")
+    args = parser.parse_args()
+
+    if not os.path.exists("/proc/self/status"):
+        raise SystemExit("This benchmark reads /proc and only runs on Linux")
+    ensure_sample_model()
+
+    report = {"model_file": _worker("")}
+    _worker(args.mmap_path)  # exports the arrays if missing or stale
+    report["mapped"] = _worker(args.mmap_path)
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
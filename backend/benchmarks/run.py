@@ -0,0 +1,203 @@
+"""
+API benchmark suite.
+
+Starts the app in-process against an in-memory MongoDB (mongomock-motor) and
+the sample model, drives each scenario with a fixed number of requests at a
+configurable concurrency and prints one JSON report with throughput and
+p50/p95/p99 latency per scenario, so runs can be compared across commits.
+Absolute numbers include the in-memory database and the in-process
+transport; compare runs made on the same machine. The in-memory database
+answers without yielding to the event loop, so database-bound scenarios run
+one request at a time and their latency approximates service time.
+
+From the backend directory (pip install -r requirements-dev.txt):
+
+    python -m benchmarks.run [--requests 500] [--concurrency 16]
+                             [--scenarios predict,students_create] [--output report.json]
+"""
+
+import argparse
+import asyncio
+import json
+import platform
+import subprocess
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, NamedTuple
+import numpy as np
+from benchmarks.common import BACKEND_DIR, FEATURES, app_client, percentiles
+
+
+class Scenario(NamedTuple):
+    name: str
+    method: str
+    path: str
+    # Builds (path, json body) for request number i
+    request: Callable[[int], tuple]
+    expected_status: int = 200
+
+
+def _student(i: int, rng: np.random.Generator) -> dict:
+    return {
+        "name": f"Benchmark Student {i}",
+        "email": f"student{i}@bench.edu",
+        "roll_number": f"BENCH{i:07d}",
+        "department": ["Computer Science", "Mathematics", "Physics", "Economics"][i % 4],
+        "semester": 1 + i % 8,
+        "attendance_percentage": round(float(rng.uniform(40, 100)), 1),
+        "assessment_score": round(float(rng.uniform(30, 100)), 1),
+        "assignment_score": round(float(rng.uniform(30, 100)), 1),
+        "internal_marks": round(float(rng.uniform(30, 100)), 1),
+        "previous_semester_gpa": round(float(rng.uniform(4, 10)), 2),
+    }
+
+
+def build_scenarios(requests: int, seed: int, student_ids: List[str], batch_size: int) -> List[Scenario]:
+    """Scenarios in run order; the students_* ones reuse the ids created by students_create."""
+    rng = np.random.default_rng(seed)
+    students = [_student(i, rng) for i in range(requests)]
+    predict_rows = [
+        {name: student[name] for name in FEATURES} for student in students
+    ]
+    batch = {"students": predict_rows[:batch_size]}
+
+    return [
+        Scenario("auth_login", "POST", "/api/v1/auth/login/json",
+                 lambda i: (None, {"username": "bench", "password": "bench-password"})),
+        Scenario("predict", "POST", "/api/v1/predict",
+                 lambda i: (None, predict_rows[i % len(predict_rows)])),
+        Scenario("predict_batch", "POST", "/api/v1/predict/batch",
+                 lambda i: (None, batch)),
+        Scenario("students_create", "POST", "/api/v1/students",
+                 lambda i: (None, students[i]), expected_status=201),
+        Scenario("students_list", "GET", "/api/v1/students",
+                 lambda i: ("/api/v1/students?limit=100", None)),
+        Scenario("students_get", "GET", "/api/v1/students/{id}",
+                 lambda i: (f"/api/v1/students/{student_ids[i % len(student_ids)]}", None)),
+        Scenario("students_update", "PUT", "/api/v1/students/{id}",
+                 lambda i: (f"/api/v1/students/{student_ids[i % len(student_ids)]}",
+                            {"attendance_percentage": float(50 + i % 50)})),
+        Scenario("students_delete", "DELETE", "/api/v1/students/{id}",
+                 lambda i: (f"/api/v1/students/{student_ids[i]}", None), expected_status=204),
+    ]
+
+
+async def run_scenario(client, scenario: Scenario, requests: int, concurrency: int, headers: dict) -> Dict:
+    """Issue `requests` calls with `concurrency` workers and summarize the latencies."""
+    latencies: List[float] = []
+    errors: Dict[str, int] = {}
+    responses = []
+    next_index = 0
+
+    async def worker():
+        nonlocal next_index
+        while next_index < requests:
+            i = next_index
+            next_index += 1
+            path, body = scenario.request(i)
+            started = time.perf_counter()
+            response = await client.request(scenario.method, path or scenario.path, json=body, headers=headers)
+            latencies.append((time.perf_counter() - started) * 1000)
+            if response.status_code != scenario.expected_status:
+                errors[str(response.status_code)] = errors.get(str(response.status_code), 0) + 1
+            responses.append((i, response))
+
+    started = time.perf_counter()
+    await asyncio.gather(*[worker() for _ in range(concurrency)])
+    elapsed = time.perf_counter() - started
+
+    return {
+        "endpoint": f"{scenario.method} {scenario.path}",
+        "requests": requests,
+        "concurrency": concurrency,
+        "errors": errors,
+        "elapsed_s": round(elapsed, 3),
+        "throughput_rps": round(requests / elapsed, 1) if elapsed else None,
+        "latency_ms": percentiles(latencies),
+        "_responses": responses,
+    }
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR,
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except Exception:
+        return "unknown"
+
+
+async def run(requests: int, concurrency: int, selected: List[str], seed: int, batch_size: int) -> Dict:
+    from app.core.config import settings
+
+    student_ids: List[str] = []
+    report = {
+        "meta": {
+            "commit": _git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "requests": requests,
+            "concurrency": concurrency,
+            "seed": seed,
+            "settings": {
+                "COMPILE_MODEL": settings.COMPILE_MODEL,
+                "EXPLANATION_MODE": settings.EXPLANATION_MODE,
+                "INFERENCE_WORKERS": settings.INFERENCE_WORKERS,
+                "PREDICTION_CACHE_SIZE": settings.PREDICTION_CACHE_SIZE,
+                "USER_CACHE_SIZE": settings.USER_CACHE_SIZE,
+            },
+        },
+        "scenarios": {},
+    }
+
+    async with app_client() as client:
+        await client.post("/api/v1/auth/register", json={
+            "username": "bench", "email": "bench@example.com", "password": "bench-password"
+        })
+        login = await client.post("/api/v1/auth/login/json", json={"username": "bench", "password": "bench-password"})
+        headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+        report["meta"]["model_version"] = (await client.get("/ready")).json()["model"]["version"]
+
+        for scenario in build_scenarios(requests, seed, student_ids, batch_size):
+            if selected and scenario.name not in selected:
+                continue
+            if scenario.name in ("students_get", "students_update", "students_delete") and not student_ids:
+                report["scenarios"][scenario.name] = {"skipped": "requires students_create"}
+                continue
+
+            result = await run_scenario(client, scenario, requests, concurrency, headers)
+            responses = result.pop("_responses")
+            if scenario.name == "students_create":
+                # Keep creation order so later scenarios are reproducible
+                student_ids.extend(
+                    response.json()["_id"] for _, response in sorted(responses, key=lambda item: item[0])
+                    if response.status_code == 201
+                )
+            report["scenarios"][scenario.name] = result
+
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the API in-process and print a JSON report.")
+    parser.add_argument("--requests", type=int, default=500, help="Requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=16, help="Concurrent clients per scenario")
+    parser.add_argument("--scenarios", help="Comma-separated subset of scenarios to run")
+    parser.add_argument("--batch-size", type=int, default=100, help="Rows per /predict/batch request")
+    parser.add_argument("--seed", type=int, default=42, help="Seed for generated student data")
+    parser.add_argument("--output", help="Also write the report to this file")
+    args = parser.parse_args()
+
+    selected = [name.strip() for name in args.scenarios.split(",")] if args.scenarios else []
+    report = asyncio.run(run(args.requests, args.concurrency, selected, args.seed, args.batch_size))
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output)
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
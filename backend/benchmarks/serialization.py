@@ -0,0 +1,118 @@
+"""
+CPU cost of serializing a page of students: the previous path (Student
+models re-validated against response_model, stdlib JSON) vs. the orjson path
+that encodes the Mongo documents directly, and the compact ``fields=summary``
+page. Checks the first two produce the same JSON.
+
+No database or model is needed. From the backend directory:
+
+    python -m benchmarks.serialization [--rows 500] [--repeat 50]
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+from datetime import datetime, timedelta
+from typing import List
+from bson import ObjectId
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+from app.schemas.student import Student
+from app.utils.responses import SUMMARY_FIELDS, students_response
+from benchmarks.common import percentiles
+
+
+def _documents(rows: int, seed: int) -> List[dict]:
+    """Student documents as StudentModel.get_page returns them."""
+    rng = random.Random(seed)
+    created = datetime(2024, 1, 15, 10, 30)
+    documents = []
+    for i in range(rows):
+        timestamp = created + timedelta(seconds=i, milliseconds=rng.randint(0, 999))
+        documents.append({
+            "_id": str(ObjectId()),
+            "name": f"Student {i}",
+            "email": f"student{i}@university.edu",
+            "roll_number": f"2024CS{i:05d}",
+            "department": rng.choice(["Computer Science", "Mechanical", "Physics"]),
+            "semester": rng.randint(1, 8),
+            "phone": None if i % 3 else "+1234567890",
+            "attendance_percentage": round(rng.uniform(40, 100), 1),
+            "assessment_score": round(rng.uniform(30, 100), 1),
+            "assignment_score": round(rng.uniform(30, 100), 1),
+            "internal_marks": round(rng.uniform(30, 100), 1),
+            "previous_semester_gpa": round(rng.uniform(4, 10), 2),
+            "dropout_probability": rng.random(),
+            "risk_score": rng.randint(0, 100),
+            "risk_level": rng.choice(["Low", "Medium", "High"]),
+            "model_version": "9998acc7f54f",
+            "created_at": timestamp,
+            "updated_at": timestamp,
+        })
+    return documents
+
+
+async def _legacy(documents: List[dict], field) -> bytes:
+    """What FastAPI did for `return [Student(**doc) ...]` with response_model=List[Student]."""
+    content = [Student(**document) for document in documents]
+    serialized = await serialize_response(field=field, response_content=content)
+    return JSONResponse(serialized).body
+
+
+async def _fast(documents: List[dict], field) -> bytes:
+    return students_response(documents).body
+
+
+async def _summary(documents: List[dict], field) -> bytes:
+    return students_response(documents, fields=SUMMARY_FIELDS).body
+
+
+async def _measure(name: str, render, documents: List[dict], field, repeat: int) -> dict:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        await render(documents, field)
+        timings.append((time.perf_counter() - started) * 1000)
+    return {"path": name, "ms_per_page": percentiles(timings)}
+
+
+async def run(rows: int, repeat: int, seed: int) -> dict:
+    documents = _documents(rows, seed)
+    field = create_response_field(name="Response_Get_Students", type_=List[Student])
+
+    legacy_body = await _legacy(documents, field)
+    fast_body = await _fast(documents, field)
+    if json.loads(legacy_body) != json.loads(fast_body):
+        raise SystemExit("Fast path output differs from the response_model output")
+
+    legacy = await _measure("response_model+json", _legacy, documents, field, repeat)
+    fast = await _measure("orjson", _fast, documents, field, repeat)
+    summary = await _measure("orjson fields=summary", _summary, documents, field, repeat)
+    return {
+        "rows": rows,
+        "repeat": repeat,
+        "bytes": {
+            "legacy": len(legacy_body),
+            "fast": len(fast_body),
+            "summary": len(await _summary(documents, field)),
+        },
+        "results": [legacy, fast, summary],
+        "speedup_p50": round(legacy["ms_per_page"]["p50"] / fast["ms_per_page"]["p50"], 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare student page serialization paths.")
+    parser.add_argument("--rows", type=int, default=500, help="Students per page")
+    parser.add_argument("--repeat", type=int, default=50, help="Pages serialized per path")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    print(json.dumps(asyncio.run(run(args.rows, args.repeat, args.seed)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
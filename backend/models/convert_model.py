@@ -0,0 +1,32 @@
+"""
+Convert a pickled XGBoost model to XGBoost's native JSON or UBJ format.
+
+Native files load faster than pickles, do not execute code on load and stay
+readable across XGBoost versions. Point MODEL_PATH at the converted file.
+
+    python models/convert_model.py models/student_xgboost_model.pkl models/student_xgboost_model.ubj
+"""
+
+import sys
+from pathlib import Path
+import joblib
+
+
+def convert_model(source: Path, target: Path):
+    """Load a joblib pickle and save it in the format given by target's suffix (.json or .ubj)."""
+    if target.suffix.lower() not in (".json", ".ubj"):
+        raise ValueError("Target must end in .json or .ubj")
+    
+    model = joblib.load(source)
+    if not hasattr(model, "save_model"):
+        raise ValueError(f"{source} does not contain an XGBoost model")
+    
+    model.save_model(str(target))
+    print(f"Model saved to: {target}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        print(__doc__)
+        sys.exit(1)
+    convert_model(Path(sys.argv[1]), Path(sys.argv[2]))
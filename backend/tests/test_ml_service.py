@@ -0,0 +1,72 @@
+from datetime import datetime
+import numpy as np
+import pytest
+from app.services.ml_service import LoadedModel, MLModelService
+from app.services.tree_engine import MappedTreeModel
+
+
+def _stable_top_k(row, k):
+    """Top k columns the way the single-row path ranked them (Python's stable sort)."""
+    return sorted(range(len(row)), key=lambda column: -row[column])[:k]
+
+
+@pytest.mark.parametrize("k", [1, 2, 3, 5])
+def test_top_k_matches_stable_sort_with_ties(k):
+    rng = np.random.default_rng(0)
+    # Few distinct values, so most rows have ties, including across the top-k cut
+    scores = rng.integers(0, 4, (5000, 5)).astype(np.float64)
+    top = MLModelService._top_k(scores, k)
+    assert top.shape == (5000, min(k, 5))
+    for row, row_top in zip(scores.tolist(), top.tolist()):
+        assert row_top == _stable_top_k(row, k)
+
+
+def test_top_k_all_equal():
+    scores = np.zeros((3, 5))
+    assert MLModelService._top_k(scores, 3).tolist() == [[0, 1, 2]] * 3
+
+
+def test_top_k_continuous_scores():
+    scores = np.random.default_rng(1).normal(size=(2000, 5))
+    top = MLModelService._top_k(scores, MLModelService.TOP_FACTORS)
+    for row, row_top in zip(scores.tolist(), top.tolist()):
+        assert row_top == _stable_top_k(row, MLModelService.TOP_FACTORS)
+
+
+def _single_row_factors(importances, labels, row):
+    """Importance-mode risk factors for one student as the original per-row code built them."""
+    ideal = [100, 100, 100, 100, 10]
+    weighted = [
+        {"feature": label, "value": value, "importance": float(importance),
+         "weighted_score": float(importance * (limit - value) / limit)}
+        for label, value, importance, limit in zip(labels, row, importances, ideal)
+    ]
+    weighted.sort(key=lambda factor: factor["weighted_score"], reverse=True)
+    factors = []
+    for factor in weighted[:3]:
+        feature, value = factor["feature"], factor["value"]
+        if "Attendance" in feature:
+            text = f"Low attendance ({value}%) - Below required 75%" if value < 75 else f"Attendance at {value}% - Could be improved"
+        elif "GPA" in feature:
+            text = f"Low previous GPA ({value}) - Academic support needed" if value < 6.0 else f"Previous GPA at {value} - Maintain consistency"
+        else:
+            text = f"{feature} is low ({value}) - Below passing threshold" if value < 60 else f"{feature} at {value} - Room for improvement"
+        factors.append({"feature": feature, "value": value, "importance": factor["importance"], "explanation": text})
+    return factors
+
+
+def test_importance_factors_match_single_row():
+    service = MLModelService()
+    importances = np.array([0.3, 0.3, 0.2, 0.1, 0.1])  # equal importances produce ties
+    active = LoadedModel(
+        model=MappedTreeModel(compiled=None, feature_importances=importances.tolist()),
+        compiled=None, version="test", path="", loaded_at=datetime.utcnow()
+    )
+    rng = np.random.default_rng(2)
+    matrix = np.column_stack([rng.integers(40, 101, 1000) for _ in range(4)] + [rng.integers(4, 11, 1000)]).astype(np.float64)
+    labels = [service._format_feature_name(name) for name in service.feature_names]
+
+    factors = service._importance_factors(active, matrix)
+    model_importances = np.asarray(active.model.feature_importances_, dtype=np.float64)
+    for row, row_factors in zip(matrix.tolist(), factors):
+        assert row_factors == _single_row_factors(model_importances, labels, row)
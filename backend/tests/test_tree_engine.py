@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+from xgboost import XGBClassifier
+from app.services.tree_engine import CompiledTreeEnsemble, MappedTreeModel, compile_model
+
+FEATURE_NAMES = [f"f{i}" for i in range(5)]
+
+
+@pytest.fixture(scope="module")
+def model():
+    """Small classifier trained with missing values so default directions matter."""
+    rng = np.random.default_rng(0)
+    X = rng.uniform(0, 100, (2000, 5))
+    y = (X @ np.array([0.3, 0.25, 0.2, 0.15, 0.1]) + rng.normal(0, 10, 2000) > 50).astype(int)
+    X[rng.random(X.shape) < 0.1] = np.nan
+    classifier = XGBClassifier(n_estimators=50, max_depth=4, objective="binary:logistic")
+    classifier.fit(X, y)
+    return classifier
+
+
+def _inputs(seed: int, rows: int = 2000) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    X = rng.uniform(-10, 110, (rows, 5))
+    X[rng.random(X.shape) < 0.15] = np.nan
+    X[:5] = np.nan  # rows that follow default directions only
+    return X
+
+
+def test_compiled_matches_predict_proba(model):
+    compiled = compile_model(model, FEATURE_NAMES)
+    X = _inputs(1)
+    expected = model.predict_proba(X)
+    np.testing.assert_allclose(compiled.predict_proba(X), expected, atol=1e-5, rtol=0)
+    assert compiled.max_abs_error(model, X) < 1e-5
+
+
+def test_compiled_single_row(model):
+    compiled = compile_model(model, FEATURE_NAMES)
+    row = _inputs(2, rows=1)[0]
+    np.testing.assert_allclose(compiled.predict_proba(row), model.predict_proba(row[None, :]), atol=1e-5, rtol=0)
+
+
+def test_save_load_mapped_round_trip(model, tmp_path):
+    compiled = compile_model(model, FEATURE_NAMES)
+    path = tmp_path / "model.flat"
+    metadata = {"model_version": "abc123", "feature_names": FEATURE_NAMES}
+    compiled.save(path, metadata)
+
+    mapped, loaded_metadata = CompiledTreeEnsemble.load_mapped(path)
+    assert loaded_metadata == metadata
+    assert (mapped.max_depth, mapped.base_margin) == (compiled.max_depth, compiled.base_margin)
+    for name in ("feature", "threshold", "left", "right", "default_left", "value", "roots"):
+        np.testing.assert_array_equal(getattr(mapped, name), getattr(compiled, name))
+        assert getattr(mapped, name).dtype == getattr(compiled, name).dtype
+        assert not getattr(mapped, name).flags.writeable
+
+    X = _inputs(3)
+    np.testing.assert_array_equal(mapped.predict_proba(X), compiled.predict_proba(X))
+    np.testing.assert_array_equal(MappedTreeModel(mapped).predict_proba(X), compiled.predict_proba(X))
+
+
+def test_load_mapped_rejects_other_files(tmp_path):
+    path = tmp_path / "junk.flat"
+    path.write_bytes(b"not a mapped ensemble")
+    with pytest.raises(ValueError):
+        CompiledTreeEnsemble.load_mapped(path)